@@ -0,0 +1,14 @@
+"""
+Benchmarks for evnt, in the format of airspeed velocity (asv):
+
+    asv run                         # benchmark the history of the repository
+    asv run --python=same --quick   # benchmark the current environment
+
+or, without asv installed,
+
+    python -m benchmarks [filter]
+
+Functions named ``time_*`` measure wall time, ``peakmem_*`` the peak
+resident memory of the process, and ``track_*`` the peak memory
+allocated during the operation, as traced by `tracemalloc`.
+"""
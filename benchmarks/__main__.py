@@ -0,0 +1,98 @@
+"""
+Run the benchmarks once each, without asv:
+
+    python -m benchmarks [filter]
+
+where ``filter`` is a substring of the benchmark names to run.
+Times are the best of several repeats; ``peakmem_*`` benchmarks
+are reported as the memory traced by `tracemalloc` since they
+share one process here.
+"""
+import sys
+import time
+import subprocess
+import inspect
+import itertools
+import importlib
+from pathlib import Path
+
+from .common import traced_peak
+
+PREFIXES = ("time_", "timeraw_", "peakmem_", "track_")
+
+
+def _benchmarks():
+    for path in sorted(Path(__file__).parent.glob("bench_*.py")):
+        module = importlib.import_module(f"{__package__}.{path.stem}")
+        for name, _ in inspect.getmembers(module, inspect.isfunction):
+            if name.startswith(PREFIXES):
+                yield f"{path.stem}.{name}", module, name
+        for cname, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            for name, _ in inspect.getmembers(cls, inspect.isfunction):
+                if name.startswith(PREFIXES):
+                    yield f"{path.stem}.{cname}.{name}", cls, name
+
+
+def _timeraw(code):
+    # Best of several runs of `code` in a new interpreter, less
+    # the time to start the interpreter
+    def run(code):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        return time.perf_counter() - start
+    best = min(run(code) for _ in range(5)) - min(run("pass") for _ in range(5))
+    return f"{best*1e3:10.2f} ms"
+
+
+def _run(cls, name, params, cache):
+    if inspect.ismodule(cls):
+        return _timeraw(getattr(cls, name)())
+
+    bench = cls()
+    args  = (cache, *params) if cache is not None else params
+    if hasattr(bench, "setup"):
+        bench.setup(*args)
+    try:
+        method = getattr(bench, name)
+        if name.startswith("time_"):
+            best, total, repeat = float("inf"), 0.0, 0
+            while repeat < 3 or (total < 1.0 and repeat < 20):
+                start = time.perf_counter()
+                method(*args)
+                best = min(best, time.perf_counter() - start)
+                total += time.perf_counter() - start
+                repeat += 1
+            return f"{best*1e3:10.2f} ms"
+        elif name.startswith("peakmem_"):
+            return f"{traced_peak(method, *args)/2**20:10.2f} MB (traced)"
+        else:
+            return f"{method(*args)/2**20:10.2f} MB"
+    finally:
+        if hasattr(bench, "teardown"):
+            bench.teardown(*args)
+
+
+def main(pattern=""):
+    caches = {}
+    for label, cls, name in _benchmarks():
+        if pattern not in label:
+            continue
+        params = getattr(cls, "params", [])
+        if params and not isinstance(params, tuple):
+            params = (params,)
+        if cls not in caches and not inspect.ismodule(cls):
+            caches[cls] = cls().setup_cache() if hasattr(cls, "setup_cache") else None
+
+        for values in itertools.product(*params):
+            title = f"{label}({', '.join(map(str, values))})"
+            try:
+                result = _run(cls, name, values, caches.get(cls))
+            except NotImplementedError as e:
+                result = f"skipped: {e}"
+            print(f"{title:<80s} {result}", flush=True)
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
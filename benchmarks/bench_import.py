@@ -0,0 +1,16 @@
+"""
+Benchmarks for the time to import evnt, each in a new interpreter.
+"""
+
+def timeraw_import_evnt():
+    return "import evnt"
+
+
+def timeraw_import_core():
+    return "import evnt.core"
+
+
+def timeraw_summarize():
+    # Cold start of reading one header, as in the CLI
+    from .common import DAT, TEMPLATE
+    return f"import evnt; evnt.read({str(DAT/TEMPLATE)!r}, summarize=True)"
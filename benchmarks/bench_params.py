@@ -0,0 +1,46 @@
+"""
+Benchmarks for the waveform parameters of `StructuralWaveforms`.
+"""
+import numpy as np
+
+from .common import DAT, TEMPLATE
+
+
+class WaveformParameters:
+    """Each ``StructuralWaveforms.compute_*`` on one channel of `TEMPLATE`."""
+    params = [
+        "compute_cav",
+        "compute_zero_crossing_rate",
+        "compute_mean",
+        "compute_standard_deviation",
+        "compute_rms",
+        "compute_pga",
+        "compute_envelope",
+        "compute_skewness",
+        "compute_kurtosis",
+    ]
+    param_names = ["method"]
+
+    def setup(self, method):
+        try:
+            from evnt.parse.compute_params import StructuralWaveforms
+        except ImportError:
+            # asv skips benchmarks whose setup raises NotImplementedError
+            raise NotImplementedError("compute_params dependencies are not installed")
+
+        import evnt
+        series = evnt.read(DAT/TEMPLATE).series[0]
+        # The compute_* methods only need the sampling frequency,
+        # so the waveforms are not opened from a file.
+        waveforms = StructuralWaveforms.__new__(StructuralWaveforms)
+        waveforms.zip_obj = None
+        waveforms.sampling_frequency = 1/series.meta["time_step"]
+
+        self.method = getattr(waveforms, method)
+        # Convert to m/s/s, the units of the CAV threshold
+        self.data = np.asarray(series.accel)/100
+        if method in ("compute_skewness", "compute_kurtosis"):
+            self.data = waveforms.compute_envelope(self.data)
+
+    def time_compute(self, method):
+        self.method(self.data)
@@ -0,0 +1,110 @@
+"""
+Benchmarks for reading the event archives in dat/.
+"""
+import zipfile
+import tempfile
+from pathlib import Path
+
+import evnt
+from evnt.parse import v2, smc
+
+from .common import DAT, ARCHIVES, V2_ARCHIVES, SMC_ARCHIVES, members, traced_peak, synthetic_archive
+
+
+class ReadArchive:
+    """`evnt.read` of each bundled archive."""
+    params = ARCHIVES
+    param_names = ["archive"]
+
+    def setup(self, archive):
+        self.path = DAT/archive
+
+    def time_read(self, archive):
+        evnt.read(self.path)
+
+    def peakmem_read(self, archive):
+        evnt.read(self.path)
+
+    def track_read_alloc(self, archive):
+        return traced_peak(evnt.read, self.path)
+    track_read_alloc.unit = "bytes"
+
+    def time_summarize(self, archive):
+        evnt.read(self.path, summarize=True)
+
+    def track_summarize_alloc(self, archive):
+        return traced_peak(evnt.read, self.path, summarize=True)
+    track_summarize_alloc.unit = "bytes"
+
+    def time_read_lazy(self, archive):
+        evnt.read(self.path, lazy=True)
+
+
+class ReadV2Record:
+    """`v2.read_record` of each channel in a .v2 archive."""
+    params = V2_ARCHIVES
+    param_names = ["archive"]
+
+    def setup(self, archive):
+        self.archive = zipfile.ZipFile(DAT/archive)
+        self.files = members(archive, (".v2",))
+
+    def teardown(self, archive):
+        self.archive.close()
+
+    def time_read_record(self, archive):
+        for file in self.files:
+            v2.read_record(file, self.archive)
+
+    def track_read_record_alloc(self, archive):
+        return max(traced_peak(v2.read_record, file, self.archive) for file in self.files)
+    track_read_record_alloc.unit = "bytes"
+
+
+class ReadSmcRecord:
+    """`smc.read_record` of each file in a .smc archive."""
+    params = SMC_ARCHIVES
+    param_names = ["archive"]
+
+    def setup(self, archive):
+        self.archive = zipfile.ZipFile(DAT/archive)
+        self.files = members(archive, (".smc",))
+
+    def teardown(self, archive):
+        self.archive.close()
+
+    def time_read_record(self, archive):
+        for file in self.files:
+            smc.read_record(file, self.archive)
+
+    def track_read_record_alloc(self, archive):
+        return max(traced_peak(smc.read_record, file, self.archive) for file in self.files)
+    track_read_record_alloc.unit = "bytes"
+
+
+class ReadScaling:
+    """
+    `evnt.read` of synthetic .v2 archives, for the scaling of read
+    time and memory with the length and number of channels.
+    """
+    params = ([1, 10], [10_000, 100_000, 1_000_000])
+    param_names = ["channels", "npts"]
+    timeout = 300
+
+    def setup_cache(self):
+        directory = Path(tempfile.mkdtemp(prefix="evnt-bench-"))
+        return {
+            (channels, npts): str(synthetic_archive(directory/f"synthetic_{channels}_{npts}.zip", channels, npts))
+            for channels in self.params[0] for npts in self.params[1]
+        }
+
+    def time_read(self, paths, channels, npts):
+        evnt.read(paths[(channels, npts)])
+
+    def peakmem_read(self, paths, channels, npts):
+        evnt.read(paths[(channels, npts)])
+
+    def time_iter_chunks(self, paths, channels, npts):
+        with zipfile.ZipFile(paths[(channels, npts)]) as archive:
+            for _ in v2.iter_chunks("chan001.v2", "displ", archive=archive):
+                pass
@@ -0,0 +1,34 @@
+"""
+Benchmarks for the rotation of `Vector` components.
+"""
+import numpy as np
+
+from evnt.core import Vector, TimeSeries
+
+
+class RotateVector:
+    """`Vector.rotate` of three components, for one angle and a sweep."""
+    params = ([10_000, 100_000], [1, 180])
+    param_names = ["npts", "angles"]
+
+    def setup(self, npts, angles):
+        rng = np.random.default_rng(0)
+        self.vector = Vector({
+            dirn: TimeSeries(*rng.standard_normal((3, npts)))
+            for dirn in ("hor1", "hor2", "vert")
+        })
+        self.angles = np.linspace(0, np.pi, angles, endpoint=False)
+        # Build the buffers before timing
+        self.vector.accel, self.vector.veloc, self.vector.displ
+
+    def time_rotate(self, npts, angles):
+        if angles == 1:
+            self.vector.rotate(self.angles[0])
+        else:
+            self.vector.rotate(self.angles, inplace=False)
+
+    def time_rotd(self, npts, angles):
+        self.vector.rotd(angles=self.angles)
+
+    def peakmem_rotd(self, npts, angles):
+        self.vector.rotd(angles=self.angles)
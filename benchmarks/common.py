@@ -0,0 +1,82 @@
+"""
+Data files and helpers shared by the benchmarks.
+"""
+import io
+import zipfile
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+DAT = Path(__file__).resolve().parents[1]/"dat"
+
+# Sample archives bundled in dat/
+V2_ARCHIVES = [
+    "58658_007_20210426_10.09.54.P.zip",
+    "RioDell_Petrolia_Processed_Data.zip",
+    "imperialvalley79_ce01336p.zip",
+    "nc73654060_ce58658p.zip",
+    "tomsplace_26nov2006_ce54730p.zip",
+]
+SMC_ARCHIVES = [
+    "berkeley_04jan2018_72948801_np1103p.zip",
+]
+ARCHIVES = V2_ARCHIVES + SMC_ARCHIVES
+
+# Archive used as the template for synthetic archives
+TEMPLATE = "58658_007_20210426_10.09.54.P.zip"
+
+
+def traced_peak(f, *args, **kwds) -> int:
+    """
+    Peak memory in bytes allocated while calling ``f``,
+    as traced by `tracemalloc`.
+    """
+    tracemalloc.start()
+    try:
+        f(*args, **kwds)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def members(archive, suffixes) -> list:
+    """Names of the members of ``archive`` ending in one of ``suffixes``."""
+    with zipfile.ZipFile(DAT/archive) as z:
+        return [name for name in z.namelist() if name.lower().endswith(suffixes)]
+
+
+def synthetic_v2(npts: int, seed: int = 0) -> bytes:
+    """
+    A .v2 channel with the headers of the first channel of `TEMPLATE`
+    and ``npts`` random samples of each of accel, veloc and displ.
+    """
+    rng = np.random.default_rng(seed)
+    with zipfile.ZipFile(DAT/TEMPLATE) as z:
+        lines = z.read(sorted(members(TEMPLATE, (".v2",)))[0]).decode("latin-1").splitlines()
+
+    units = {"accel": "cm/sec2.", "veloc": "cm/sec. ", "displ": "cm.     "}
+    out = io.StringIO()
+    out.write("\r\n".join(lines[:45]) + "\r\n")
+    for typ, unit in units.items():
+        out.write(f"{npts:6d} points of {typ} data equally spaced at 0.005 sec, in {unit:<9s}(8f10.6)\r\n")
+        data = rng.uniform(-99, 99, npts)
+        rows = np.full(-(-npts // 8)*8, np.nan)
+        rows[:npts] = data
+        text = "\r\n".join("".join(f"{x:10.6f}" for x in row if x == x) for row in rows.reshape(-1, 8))
+        out.write(text + "\r\n")
+    out.write("/&\r\n")
+    return out.getvalue().encode("latin-1")
+
+
+def synthetic_archive(path, nchannels: int, npts: int) -> Path:
+    """
+    Write a zipped event of ``nchannels`` synthetic .v2 channels
+    of ``npts`` samples each to ``path``.
+    """
+    path = Path(path)
+    channel = synthetic_v2(npts)
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        for i in range(nchannels):
+            z.writestr(f"chan{i+1:03d}.v2", channel)
+    return path
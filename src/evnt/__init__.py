@@ -2,15 +2,42 @@
 .. currentmodule:: evnt
 """
 
-from evnt.core import get_parser
+# Submodules are imported when they are first accessed
+# (eg, `evnt.parse`), so that `import evnt` stays cheap.
+_SUBMODULES = {"catalog", "core", "parse", "param", "utils"}
 
-def read(path_to_file, **kwds):
+# Names re-exported from submodules, and the module they come from
+_EXPORTS = {"get_parser": "core"}
+
+def __getattr__(name):
+    import importlib
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    if name in _EXPORTS:
+        module = importlib.import_module(f"{__name__}.{_EXPORTS[name]}")
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES | set(_EXPORTS))
+
+
+def read(path_to_file, cache=None, **kwds):
     """
     Get the `Record` or `TimeSeries` from a file.
 
     :param path_to_file:        path to zipfile with extension .zip
                                 or motion file with extension .smc, .v2, etc.
     :type path_to_file:         pathlib Path object, or string.
+    :param cache:               if True, or a `evnt.utils.cache.RecordCache`,
+                                parsed records are kept on disk and reused
+                                when the same file is read again.
+    :param kwds:                passed on to the parser; for example,
+                                ``summarize=True`` to read only the headers,
+                                ``lazy=True`` to decode data when first
+                                accessed, or ``workers=N`` to decode the
+                                files of an archive over ``N`` threads.
     
     :return:                    parsed records that are printable (`print`)
                                 and summarizable (`.meta`).
@@ -18,6 +45,81 @@ def read(path_to_file, **kwds):
                                 if motion file: `TimeSeries` object.
     """
 
+    if cache and not kwds.get("summarize", False):
+        from evnt.utils.cache import RecordCache
+        if cache is True:
+            cache = RecordCache()
+        return cache.read(path_to_file, **kwds)
+
+    from evnt.core import get_parser
     _, parser = get_parser(path_to_file)
     record = parser(path_to_file,**kwds)
     return record
+
+
+def read_many(paths, workers: int = None, chunksize: int = 1, ordered: bool = True,
+              progress=None, **kwds):
+    """
+    Read many files, fanning them out over a pool of processes.
+
+    :param paths:               paths to zipfiles or motion files, as
+                                accepted by `read`.
+    :type paths:                iterable of pathlib Path objects, or strings.
+    :param workers:             number of processes to use. defaults to the
+                                number of CPUs; ``0`` or ``1`` reads all files
+                                in the current process.
+    :param chunksize:           number of files sent to a process at a time;
+                                values below ``1`` are taken as ``1``.
+    :param ordered:             if True, results are produced in the order of
+                                ``paths``; otherwise as soon as they are read.
+    :param progress:            optional callable, called as
+                                ``progress(done, total)`` after each file.
+    :param kwds:                passed on to `read` (e.g. ``summarize=True``).
+
+    :return:                    ``(path, record)`` pairs. if a file could not
+                                be read, ``record`` is the exception that
+                                was raised while reading it.
+    :rtype:                     generator of tuples
+    """
+    import os
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    paths  = list(paths)
+    total  = len(paths)
+    chunksize = max(int(chunksize), 1)
+    chunks = [paths[i:i+chunksize] for i in range(0, total, chunksize)]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(chunks))
+
+    done = 0
+    if workers <= 1:
+        for chunk in chunks:
+            for result in _read_chunk(chunk, kwds):
+                done += 1
+                if progress is not None:
+                    progress(done, total)
+                yield result
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_read_chunk, chunk, kwds) for chunk in chunks]
+        for future in (futures if ordered else as_completed(futures)):
+            for result in future.result():
+                done += 1
+                if progress is not None:
+                    progress(done, total)
+                yield result
+
+
+def _read_chunk(paths, kwds):
+    # Runs in the worker processes; errors are returned rather
+    # than raised so that one bad file does not stop the batch.
+    results = []
+    for path in paths:
+        try:
+            results.append((path, read(path, **kwds)))
+        except Exception as e:
+            results.append((path, e))
+    return results
@@ -1,36 +1,231 @@
 # gets called when running evnt from the command line:
 #    python -m evnt ...
 #
-
-import evnt
 import sys
+import glob
+import json
+import argparse
+from pathlib import Path
+from collections import Counter
 
 HELP = """
-python -m evnt <path to zip>
-python -m evnt -p <path to zip>
-python -m evnt --path <path to zip>
+python -m evnt summarize [--jobs N] <path>...
+python -m evnt convert   [--jobs N] [--to json|npz|parquet|evnt] [--output DIR] <path>...
+python -m evnt stats     [--jobs N] [--which STAT,...] <path>...
+
+Each <path> may be an archive or motion file, a glob pattern, or a
+directory, which is searched for .zip archives. Results are written to
+stdout as one JSON object per line (NDJSON); files that cannot be read
+are reported on stderr.
 """
 
+# File extensions of each conversion format
+FORMATS = {"json": ".json", "npz": ".npz", "parquet": ".parquet", "evnt": ".evnt"}
 
-def parse_args(args):
-    filepath = None
-    argi = iter(args[1:])
-    for arg in argi:
-        if arg in ["-p", "--path"]:
-            filepath = next(argi)
-        elif filepath is None:
-            filepath = arg
+
+def expand_paths(patterns) -> list:
+    """
+    Expand the paths given on the command line; glob patterns are
+    matched, and directories are searched recursively for archives.
+    """
+    paths = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
         else:
-            print(HELP)
-            sys.exit()
-    return
+            matches = [pattern]
+        for path in map(Path, matches):
+            if path.is_dir():
+                paths.extend(sorted(path.rglob("*.zip")))
+            else:
+                paths.append(path)
+    return paths
 
 
-def main():
-    parse_args(sys.argv)
+def output_names(paths) -> dict:
+    """
+    Names, without the extension, of the files that `convert` writes
+    for each of ``paths``. Inputs that share a name (eg, the same file
+    name in different directories) are numbered in the order given,
+    so that no output overwrites another.
+    """
+    counts = Counter(Path(path).stem for path in paths)
+    names, used = {}, set()
+    for path in paths:
+        stem  = Path(path).stem
+        index = 0 if counts[stem] == 1 else 1
+        name  = f"{stem}-{index}" if index else stem
+        while name in used:
+            index += 1
+            name = f"{stem}-{index}"
+        used.add(name)
+        names[path] = name
+    return names
 
 
-if __name__ == "__main__":
-    main()
-    sys.exit()
+def _series(record) -> list:
+    return record.series if hasattr(record, "series") else [record]
+
+
+def summarize(path, **kwds) -> list:
+    import evnt
+    record = evnt.read(path, summarize=True)
+    return [{
+        "file": str(path),
+        **record.meta,
+        "series": [dict(s.meta) for s in _series(record)]
+    }]
+
+
+def stats(path, which=None, **kwds) -> list:
+    import evnt
+    from evnt.param.stats import record_stats
+    record = evnt.read(path)
+    if not hasattr(record, "series"):
+        from evnt.core import Record
+        record = Record([record])
+    table = record_stats(record, which=which)
+    return [
+        {"file": str(path), "station_channel": channel, **row}
+        for channel, row in table.to_dict(orient="index").items()
+    ]
+
+
+def convert(path, to="json", output=".", names=None, **kwds) -> list:
+    import evnt
+    import numpy as np
+    from evnt.utils.processing import json_serialize
+
+    record = evnt.read(path)
+    series = _series(record)
+    # names from `output_names`, when converting several files
+    name = names[path] if names else Path(path).stem
+    out = Path(output)/(name + FORMATS[to])
+    quantities = ("accel", "veloc", "displ")
+
+    if to == "json":
+        with open(out, "w") as f:
+            json.dump({
+                **record.meta,
+                "series": [
+                    {**s.meta, **{q: getattr(s, q) for q in quantities if getattr(s, q) is not None}}
+                    for s in series
+                ]
+            }, f, cls=json_serialize)
+
+    elif to == "npz":
+        arrays = {
+            f"{s.meta.get('station_channel', i)}/{q}": getattr(s, q)
+            for i, s in enumerate(series) for q in quantities
+            if getattr(s, q) is not None
+        }
+        meta = json.dumps({**record.meta, "series": [dict(s.meta) for s in series]},
+                          cls=json_serialize)
+        np.savez(out, meta=np.array(meta), **arrays)
+
+    elif to == "parquet":
+        import pandas as pd
+        # One column for each channel and quantity, padded to
+        # the longest series.
+        table = pd.DataFrame({
+            f"{s.meta.get('station_channel', i)}.{q}": pd.Series(getattr(s, q))
+            for i, s in enumerate(series) for q in quantities
+            if getattr(s, q) is not None
+        })
+        table.attrs = json.loads(json.dumps(dict(record.meta), cls=json_serialize))
+        table.to_parquet(out)
+
+    elif to == "evnt":
+        from evnt.parse import native
+        from evnt.core import Record
+        native.write(out, record if hasattr(record, "series") else Record([record]))
+
+    return [{"file": str(path), "output": str(out)}]
+
+
+COMMANDS = {
+    "summarize": summarize,
+    "convert":   convert,
+    "stats":     stats,
+}
 
+
+def _apply(command, path, options):
+    # Runs in the worker processes; errors are returned
+    # so that one bad file does not stop the batch.
+    try:
+        return path, COMMANDS[command](path, **options), None
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}"
+
+
+def run(command, paths, jobs=1, **options):
+    """
+    Apply ``command`` to each of ``paths``, using ``jobs`` processes,
+    and yield ``(path, results, error)`` as each file is finished.
+    """
+    if jobs is None or jobs <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield _apply(command, path, options)
+        return
+
+    from functools import partial
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(partial(_apply, command, options=options), paths)
+
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(prog="evnt", usage=HELP,
+                                     description="Read and summarize strong motion records.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for name in COMMANDS:
+        sub = subparsers.add_parser(name)
+        sub.add_argument("paths", nargs="+", metavar="path")
+        sub.add_argument("-j", "--jobs", type=int, default=1,
+                         help="number of files to process in parallel")
+        if name == "convert":
+            sub.add_argument("-t", "--to", choices=FORMATS, default="json")
+            sub.add_argument("-o", "--output", default=".",
+                             help="directory in which to write the converted files")
+        elif name == "stats":
+            sub.add_argument("--which", type=lambda s: s.split(","), default=None,
+                             help="comma separated statistics to compute")
+
+    return vars(parser.parse_args(args[1:]))
+
+
+def main(argv=None):
+    from evnt.utils.processing import json_serialize
+
+    options = parse_args(sys.argv if argv is None else argv)
+    command = options.pop("command")
+    paths   = expand_paths(options.pop("paths"))
+    jobs    = options.pop("jobs")
+
+    if command == "convert":
+        Path(options["output"]).mkdir(parents=True, exist_ok=True)
+        options["names"] = output_names(paths)
+
+    failed = 0
+    try:
+        for path, results, error in run(command, paths, jobs, **options):
+            if error is not None:
+                failed += 1
+                print(f"evnt: {path}: {error}", file=sys.stderr)
+                continue
+            for result in results:
+                print(json.dumps(result, cls=json_serialize), flush=True)
+
+    except BrokenPipeError:
+        # The reader (eg, `head`) closed the pipe; stop quietly.
+        import os
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,365 @@
+"""
+A persistent index of the event archives in a directory tree.
+
+The catalog is a SQLite database holding the header-only summary
+(``evnt.read(..., summarize=True)``) of each archive: one row in the
+``records`` table for each file, and one row in the ``series`` table
+for each of its channels. Archives are only parsed again when their
+size or modification time changes, so that a tree of stations can be
+searched without reading every file:
+
+    >>> catalog = Catalog("motions.db")
+    >>> catalog.update("motions_ready")
+    >>> rows = catalog.query(station="NP1103", peak_accel__gt=50)
+    >>> records = catalog.read(station="58658", peak_accel__gt=50)
+
+Stations are stored as their number, without leading zeros (e.g.
+'58658'), and, when it is
+known from the archive name, the network (e.g. 'CE') in a separate
+column, so that archives of one station share a code however they
+are named. A ``station`` given to a query with a network prefix
+('CE58658') matches both columns.
+
+Peak values in the catalog are absolute values, in the units of the
+files (cm/sec/sec for acceleration).
+"""
+import re
+import json
+import sqlite3
+from pathlib import Path
+
+from evnt.utils.processing import json_serialize
+
+# Columns of each table, with their SQLite types
+RECORD_COLUMNS = {
+    "path":           "TEXT",
+    "size":           "INTEGER",
+    "mtime_ns":       "INTEGER",
+    "station":        "TEXT",
+    "network":        "TEXT",
+    "station_name":   "TEXT",
+    "station_number": "TEXT",
+    "event_date":     "TEXT",
+    "channels":       "INTEGER",
+    "peak_accel":     "REAL",
+    "peak_veloc":     "REAL",
+    "peak_displ":     "REAL",
+    "error":          "TEXT",
+    "meta":           "TEXT",
+}
+SERIES_COLUMNS = {
+    "record_id":       "INTEGER",
+    "station_channel": "TEXT",
+    "component":       "TEXT",
+    "location":        "TEXT",
+    "npts":            "INTEGER",
+    "time_step":       "REAL",
+    "peak_accel":      "REAL",
+    "peak_veloc":      "REAL",
+    "peak_displ":      "REAL",
+    "meta":            "TEXT",
+}
+
+# Comparison of each suffix of a query keyword, as in
+# `query(peak_accel__gt=50)`
+OPERATORS = {
+    "eq":   "= ?",
+    "ne":   "!= ?",
+    "gt":   "> ?",
+    "gte":  ">= ?",
+    "lt":   "< ?",
+    "lte":  "<= ?",
+    "like": "LIKE ?",
+    "in":   "IN ({})",
+}
+
+SCHEMA_VERSION = 2
+
+# Station code at the end of an archive name, e.g. the
+# 'np1103' of 'berkeley_04jan2018_72948801_np1103p.zip'
+RE_STATION = re.compile(r"_([a-z]{2})(\d{4,5})p?\.zip$", re.IGNORECASE)
+
+# Station given to a query, with an optional network prefix
+RE_STATION_QUERY = re.compile(r"([a-z]{2})?(\d+)", re.IGNORECASE)
+
+
+def _station_number(number):
+    # Station numbers without leading zeros, so that '01336'
+    # and '1336' are the same station
+    number = None if number is None else str(number).strip()
+    return number.lstrip("0") or "0" if number and number.isdigit() else number
+
+
+def _station_code(path, meta) -> tuple:
+    """
+    The ``(network, station)`` of an archive, from the end of its
+    name or, failing that, the station number in its header.
+    """
+    match = RE_STATION.search(Path(path).name)
+    if match:
+        return match.group(1).upper(), _station_number(match.group(2))
+    return None, _station_number(meta.get("station_number"))
+
+
+def _station_conditions(conditions: dict) -> dict:
+    # Split a 'station' with a network prefix ('CE58658') into
+    # conditions on the station number and the network
+    conditions = dict(conditions)
+    value = conditions.get("station")
+    if isinstance(value, str):
+        match = RE_STATION_QUERY.fullmatch(value.strip())
+        if match:
+            network, number = match.groups()
+            conditions["station"] = _station_number(number)
+            if network is not None:
+                conditions.setdefault("network", network.upper())
+    return conditions
+
+
+def _peak(values):
+    values = [abs(v) for v in values if isinstance(v, (int, float))]
+    return max(values) if values else None
+
+
+def _where(columns: dict, conditions: dict, table: str):
+    """
+    SQL condition and parameters for keywords like ``peak_accel__gt=50``;
+    columns are checked against ``columns`` so that only known names
+    are put into the query.
+    """
+    clauses, params = [], []
+    for key, value in conditions.items():
+        name, _, op = key.partition("__")
+        op = op or "eq"
+        if name not in columns or op not in OPERATORS:
+            raise ValueError(f"Unknown catalog query {key!r}; expected a column of "
+                             f"{sorted(columns)} with an optional suffix of {sorted(OPERATORS)}")
+        if op == "in":
+            if isinstance(value, (str, bytes)):
+                value = [value]
+            try:
+                value = list(value)
+            except TypeError:
+                raise TypeError(f"The value of {key!r} must be a sequence, "
+                                f"not {type(value).__name__}") from None
+            clauses.append(f"{table}.{name} " + OPERATORS[op].format(", ".join("?"*len(value))))
+            params.extend(value)
+        elif value is None and op in ("eq", "ne"):
+            clauses.append(f"{table}.{name} IS {'NOT ' if op == 'ne' else ''}NULL")
+        else:
+            clauses.append(f"{table}.{name} {OPERATORS[op]}")
+            params.append(value)
+    return " AND ".join(clauses) or "1", params
+
+
+class Catalog:
+    """
+    SQLite index of the summaries of event archives.
+
+    :param path:        file of the database; created if it does not
+                        exist. ``":memory:"`` keeps the catalog in memory.
+    """
+    def __init__(self, path=":memory:"):
+        self.path = path
+        self._db  = sqlite3.connect(str(path))
+        self._db.row_factory = sqlite3.Row
+        self._create()
+
+    def __repr__(self):
+        return f"Catalog({str(self.path)!r})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def close(self):
+        self._db.close()
+
+    def _create(self):
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise ValueError(f"Catalog {self.path} has schema version {version}; "
+                             f"expected {SCHEMA_VERSION}")
+        with self._db:
+            if 0 < version < SCHEMA_VERSION:
+                # An index of an older layout is rebuilt by the next `update`
+                self._db.execute("DROP TABLE IF EXISTS series")
+                self._db.execute("DROP TABLE IF EXISTS records")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS records (id INTEGER PRIMARY KEY, "
+                + ", ".join(f"{name} {typ}" for name, typ in RECORD_COLUMNS.items())
+                + ", UNIQUE(path))")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS series ("
+                + ", ".join(f"{name} {typ}" for name, typ in SERIES_COLUMNS.items())
+                + ", FOREIGN KEY(record_id) REFERENCES records(id) ON DELETE CASCADE)")
+            for table, column in (("records", "station"), ("records", "event_date"),
+                                  ("records", "peak_accel"), ("series", "record_id")):
+                self._db.execute(f"CREATE INDEX IF NOT EXISTS {table}_{column} ON {table}({column})")
+            self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def update(self, *paths, pattern: str = "**/*.zip", workers: int = 1,
+               prune: bool = True, progress=None) -> dict:
+        """
+        Add the archives in ``paths`` to the catalog, and re-read those
+        whose size or modification time has changed since they were
+        added. Directories are searched for files matching ``pattern``.
+        Files that cannot be read are kept in the catalog with their
+        ``error``, so that they are not read again until they change.
+
+        :param workers:     number of processes over which to read the
+                            archives (see `evnt.read_many`)
+        :param prune:       if True, remove the entries of files that no
+                            longer exist
+        :param progress:    passed on to `evnt.read_many`
+
+        :return:            numbers of files ``added``, ``updated``,
+                            ``unchanged``, ``failed`` and ``removed``
+        :rtype:             dict
+        """
+        import evnt
+
+        files = []
+        for path in map(Path, paths):
+            if path.is_dir():
+                files.extend(sorted(p for p in path.glob(pattern) if p.is_file()))
+            else:
+                files.append(path)
+
+        known = {row["path"]: (row["size"], row["mtime_ns"])
+                 for row in self._db.execute("SELECT path, size, mtime_ns FROM records")}
+
+        counts = dict(added=0, updated=0, unchanged=0, failed=0, removed=0)
+        stats, stale = {}, []
+        for file in files:
+            key = str(file.resolve())
+            stat = file.stat()
+            stats[key] = stat
+            if known.get(key) == (stat.st_size, stat.st_mtime_ns):
+                counts["unchanged"] += 1
+            else:
+                stale.append(key)
+
+        with self._db:
+            for path, record in evnt.read_many(stale, workers=workers, summarize=True,
+                                               progress=progress):
+                counts["updated" if path in known else "added"] += 1
+                if isinstance(record, Exception):
+                    counts["failed"] += 1
+                self._insert(path, stats[path], record)
+
+            if prune:
+                for path in known:
+                    if path not in stats and not Path(path).exists():
+                        self._db.execute("DELETE FROM series WHERE record_id IN "
+                                         "(SELECT id FROM records WHERE path = ?)", (path,))
+                        self._db.execute("DELETE FROM records WHERE path = ?", (path,))
+                        counts["removed"] += 1
+
+        return counts
+
+    def _insert(self, path, stat, record):
+        row = dict.fromkeys(RECORD_COLUMNS)
+        row.update(path=path, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+
+        series = []
+        if isinstance(record, Exception):
+            row["error"] = f"{type(record).__name__}: {record}"
+        else:
+            series = record.series if hasattr(record, "series") else [record]
+            meta = dict(record.meta) if hasattr(record, "series") else dict(series[0].meta)
+            network, station = _station_code(path, meta)
+            row.update(
+                station        = station,
+                network        = network,
+                station_name   = meta.get("station_name"),
+                station_number = meta.get("station_number"),
+                event_date     = meta.get("event_date"),
+                channels       = len(series),
+                meta           = json.dumps(meta, cls=json_serialize),
+                **{f"peak_{q}": _peak(s.meta.get(f"peak_{q}") for s in series)
+                   for q in ("accel", "veloc", "displ")}
+            )
+
+        self._db.execute("DELETE FROM series WHERE record_id IN "
+                         "(SELECT id FROM records WHERE path = ?)", (path,))
+        self._db.execute("DELETE FROM records WHERE path = ?", (path,))
+        record_id = self._db.execute(
+            f"INSERT INTO records ({', '.join(row)}) VALUES ({', '.join('?'*len(row))})",
+            tuple(row.values())
+        ).lastrowid
+
+        self._db.executemany(
+            f"INSERT INTO series ({', '.join(SERIES_COLUMNS)}) "
+            f"VALUES ({', '.join('?'*len(SERIES_COLUMNS))})",
+            [(record_id,
+              s.meta.get("station_channel"),
+              s.meta.get("component"),
+              s.meta.get("location"),
+              s.meta.get("npts"),
+              s.meta.get("time_step"),
+              *(_peak([s.meta.get(f"peak_{q}")]) for q in ("accel", "veloc", "displ")),
+              json.dumps(dict(s.meta), cls=json_serialize))
+             for s in series]
+        )
+
+    def query(self, **conditions) -> list:
+        """
+        Return the records matching ``conditions``, as a list of
+        dictionaries of the `RECORD_COLUMNS`. Each keyword is a column
+        name, optionally followed by ``__`` and a comparison of
+        `OPERATORS`, e.g. ``query(station="NP1103", peak_accel__gt=50,
+        event_date__gte="2018")``. Files that could not be read are
+        only included when ``error`` is queried.
+        """
+        conditions = _station_conditions(conditions)
+        where, params = _where(RECORD_COLUMNS, conditions, "records")
+        if not any(key.partition("__")[0] == "error" for key in conditions):
+            where += " AND records.error IS NULL"
+        rows = self._db.execute(
+            f"SELECT * FROM records WHERE {where} ORDER BY records.path", params)
+        return [self._row(row) for row in rows]
+
+    def series(self, **conditions) -> list:
+        """
+        Return the series matching ``conditions``, as a list of
+        dictionaries of the `SERIES_COLUMNS` and the ``path`` of their
+        file. Keywords are as for `query`; names of `SERIES_COLUMNS`
+        refer to the series, and other names to their record, e.g.
+        ``series(station="NP1103", location__like="%roof%")``.
+        """
+        conditions = _station_conditions(conditions)
+        series_conditions = {k: v for k, v in conditions.items()
+                             if k.partition("__")[0] in SERIES_COLUMNS}
+        record_conditions = {k: v for k, v in conditions.items()
+                             if k not in series_conditions}
+        where_s, params_s = _where(SERIES_COLUMNS, series_conditions, "series")
+        where_r, params_r = _where(RECORD_COLUMNS, record_conditions, "records")
+        rows = self._db.execute(
+            "SELECT series.*, records.path FROM series JOIN records ON series.record_id = records.id "
+            f"WHERE {where_s} AND {where_r} ORDER BY records.path, series.rowid",
+            params_s + params_r)
+        return [self._row(row) for row in rows]
+
+    def read(self, **conditions):
+        """
+        Read the full records of the files matching ``conditions``
+        (see `query`), one at a time.
+
+        :rtype:     generator of `Record`
+        """
+        import evnt
+        for row in self.query(**conditions):
+            yield evnt.read(row["path"])
+
+    @staticmethod
+    def _row(row) -> dict:
+        row = dict(row)
+        if row.get("meta") is not None:
+            row["meta"] = json.loads(row["meta"])
+        return row
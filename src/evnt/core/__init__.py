@@ -1,6 +1,6 @@
 """
 core classes and functions of `evnt`.
-classes: `Record`, `Vector`, and `TimeSeries`
+classes: `Record`, `Vector`, `TimeSeries`, and `TimeAxis`
 functions: `get_parser`
 
 `Record`
@@ -15,13 +15,17 @@ functions: `get_parser`
 
 `TimeSeries`
     `.accel`, `.veloc`, `.displ`: np.ndarray
+    `.time`: `TimeAxis` of the sample times
     `.meta`: dictionary-like `MetaData` object
 
 """
 
+import sys
+import weakref
+import warnings
 from pathlib import Path
 from zipfile import ZipFile
-import warnings
+from collections.abc import MutableMapping
 import numpy as np
 
 
@@ -33,6 +37,9 @@ class Record:
     `.meta`: dictionary-like `MetaData` object
     `for i in Record` to iterate through `.series`
     """
+    # Metadata keys with an index from value to `TimeSeries`,
+    # used by `filter`, `find` and `group_by`
+    INDEXED_KEYS = ('station_channel', 'component', 'location', 'floor')
 
     def __init__(self, series, meta:"MetaData"=None):
         
@@ -48,7 +55,7 @@ class Record:
         self.series = list(series)
         self._consolidate()
         
-        for s in series:
+        for s in self.series:
             s._parent = self
 
 
@@ -64,13 +71,24 @@ class Record:
     def filter(self, **kwds)->list:
         """
         Returns all `TimeSeries` in this record that satisfy
-        the properties specified by `kwds`.
+        the properties specified by `kwds`, in the order of `.series`.
+
+        Keys in `INDEXED_KEYS` are looked up in the record's indexes,
+        so only the series that match the most selective of them are
+        compared against the remaining properties. Unhashable values
+        are compared against every series.
         """
-        series = []
-        for s in self.series:
-            if all(s[k] == v for k,v in kwds.items()):
-                series.append(s)
-        return series
+        candidates = []
+        for k, v in kwds.items():
+            if k in self._index:
+                try:
+                    candidates.append(self._index[k].get(v, ()))
+                except TypeError:
+                    # Unhashable values are only compared below
+                    pass
+        series = min(candidates, key=len) if candidates else self.series
+        return [s for s in series
+                if all(s.meta.get(k, None) == v for k,v in kwds.items())]
 
 
     def find(self, **kwds)->"TimeSeries":
@@ -81,12 +99,63 @@ class Record:
         If multiple or none are found, an exception is raised.
         """
         series = self.filter(**kwds)
-        if len(series) >= 1:
+        if len(series) > 1:
             raise Exception("Multiple TimeSeries found. (Use core.filter)")
         elif len(series) == 0:
             raise Exception("No matching TimeSeries found.")
         else:
-            return series
+            return series[0]
+
+
+    def group_by(self, key)->dict:
+        """
+        A dictionary mapping each value of the metadata `key` (eg,
+        'location' or 'floor') to the list of `TimeSeries` with
+        that value. Indexed keys are read from the record's indexes.
+        """
+        if key in self._index:
+            return {value: list(series) for value, series in self._index[key].items()}
+        groups = {}
+        for s in self.series:
+            groups.setdefault(s.meta.get(key, None), []).append(s)
+        return groups
+
+
+    def compact(self)->"Record":
+        """
+        Replaces the `.meta` of each `TimeSeries` with a
+        `CompactMetaData`. Items with the same value in every series
+        (eg, the station and event) are stored once and shared between
+        the series, and between records with the same values. This
+        reduces the memory held by large collections of records, such
+        as catalogs of summaries.
+        Returns the record.
+        """
+        metas = [s.meta for s in self.series]
+        shared = {}
+        if metas:
+            for key, value in metas[0].items():
+                if key in CompactMetaData.FIELDS or not isinstance(value, (str, int, float)):
+                    continue
+                if all(key in meta and meta[key] == value for meta in metas[1:]):
+                    shared[key] = value
+        for s in self.series:
+            s.meta = CompactMetaData({k: v for k, v in s.meta.items() if k not in shared}, shared)
+        self._reindex()
+        return self
+
+
+    def _reindex(self):
+        """
+        Rebuilds the indexes from each key in `INDEXED_KEYS` to the
+        `TimeSeries` with each value of that key. This is called when
+        series are added; call it after changing the `.meta` of
+        series in the record.
+        """
+        self._index = {key: {} for key in self.INDEXED_KEYS}
+        for s in self.series:
+            for key, index in self._index.items():
+                index.setdefault(s.meta.get(key, None), []).append(s)
     
 
     def _consolidate(self,**kwds):
@@ -112,20 +181,23 @@ class Record:
                     # set the accel, veloc, and/or displ attr
                     # of the existing `TimeSeries` with the 
                     # current `TimeSeries`.
+                    # (data are moved through `vars` so that
+                    # lazily read data are not loaded.)
                     for attr in 'accel','veloc','displ':
-                        if hasattr(s,attr):
+                        if attr in vars(s):
                             # if the existing `TimeSeries` already
                             # has this attr, warn before replacing.
-                            if hasattr(existing_s,attr):
+                            if attr in vars(existing_s):
                                 if kwds.get('verbosity',0)>=0:
                                     warnings.warn(f"Multiple TimeSeries with the key,attribute {key},{attr} were found for Record {Record}. Preceding TimeSeries will be replaced.")
-                            setattr(existing_s,attr,getattr(s,attr))
+                            setattr(existing_s,attr,vars(s)[attr])
             # if the channel is not known, the TimeSeries
             # is blindly included.
             else:
                 unknown_channel.append(s)
         self.series = list(consolidated.values())
         self.series.extend(unknown_channel)
+        self._reindex()
 
 
     def append(self,series): # TODO: is it bad practice to name this the same as a list's append function?
@@ -140,9 +212,22 @@ class Record:
                 raise ValueError("All items in collection must be TimeSeries.")
             self.series.extend(list(series))
         self._consolidate()
+        for s in self.series:
+            s._parent = self
 
 
 
+def _take_columns(buffer, columns):
+    # The `columns` of a (npts, n) buffer; a view when the columns
+    # are adjacent and in order, a copy otherwise.
+    columns = list(columns)
+    if not columns:
+        return buffer[:, :0]
+    if columns == list(range(columns[0], columns[0] + len(columns))):
+        return buffer[:, columns[0]:columns[0] + len(columns)]
+    return buffer[:, columns]
+
+
 class Vector:
     """
     Has `.components`, a dictionary of `'dirn'`:`TimeSeries`
@@ -154,23 +239,16 @@ class Vector:
     when such axes exist for the station.
 
     `components`: dictionary of `'dirn'`:`TimeSeries`
+    `.accel`, `.veloc`, `.displ`: np.ndarray of shape
+        (npts, n_components), shared with the components
     `.meta`: dictionary-like `MetaData` object
     `for i in Vector` to iterate through `.series`
     """
-    def _update_components(f):
-        def wrapped(*args, **kwds):
-            res = f(*args, **kwds)
-            [getattr(cmp,attr)._refresh()
-                    for cmp in res.components.values()
-                        for attr in ["accel","veloc","displ"] if hasattr(cmp,attr)]
-            return res
-        return wrapped
-
     def __init__(self,
                  components:dict=None,
                  meta:dict=None):
         
-        self.meta = meta if meta is not None else MetaData(self)
+        self.meta = meta if meta is not None else MetaData()
 
         if (components is not None) and (not isinstance(components,dict)):
             raise TypeError("components must be a dictionary.")
@@ -179,83 +257,370 @@ class Vector:
         for comp in self.components.values():
             comp._vector_parent = self
 
+        # One (npts, n_components) array for each quantity, with a
+        # column for each component, and the views of its columns
+        # that were given to the components.
+        self._buffers = {}
+
+    def _buffer(self, quantity):
+        """
+        Returns the ``(npts, n_components)`` array of ``quantity``,
+        with columns in the order of `.components`.
+
+        The first time it is requested, the array is allocated in
+        column-major order, the data of each component is copied into
+        its column, and the component's data is replaced by a (still
+        contiguous) view of that column. Later requests return the same
+        array without copying, so changes made through the `Vector`
+        and through its components are seen by both. If a component's
+        data has since been replaced, the array is rebuilt.
+        """
+        components = tuple(self.components.values())
+        if quantity in self._buffers:
+            buffer, views = self._buffers[quantity]
+            if len(views) == len(components) and all(
+                    vars(c).get(quantity) is view for c, view in zip(components, views)):
+                return buffer
+
+        data = tuple(getattr(c, quantity) for c in components)
+        if not data or any(d is None for d in data):
+            self._buffers.pop(quantity, None)
+            return None
+
+        data = tuple(map(np.asarray, data))
+        if len({len(d) for d in data}) != 1:
+            raise ValueError(f"The {quantity} of the components of a Vector must have equal lengths.")
+
+        buffer = np.empty((len(data[0]), len(data)), dtype=np.result_type(*data), order="F")
+        for i, (component, values) in enumerate(zip(components, data)):
+            buffer[:, i] = values
+            setattr(component, quantity, buffer[:, i])
+        views = tuple(vars(c)[quantity] for c in components)
+        self._buffers[quantity] = buffer, views
+        return buffer
+
     @property
     def accel(self):
-        return np.stack(tuple(c.accel for c in self.components)).T
+        return self._buffer("accel")
 
     @property
     def veloc(self):
-        return np.stack(tuple(c.veloc for c in self.components)).T
+        return self._buffer("veloc")
 
     @property
     def displ(self):
-        return np.stack(tuple(c.displ for c in self.components)).T
+        return self._buffer("displ")
+
+    def _columns(self, *dirns):
+        # Positions of the components `dirns` in the buffers
+        keys = list(self.components)
+        return [keys.index(dirn) for dirn in dirns]
 
     def __repr__(self):
-        return f"Vector({dict.__repr__(self)})"
+        return f"Vector({self.components!r})"
+
+
+    def _rotation(self, angle=None, rotation=None, vert=None):
+        # Returns the rotation matrices, with shape (2, 2), (3, 3), or
+        # (n_angles, 2, 2) for an array of angles, and the columns of
+        # the buffers that they rotate.
+        if rotation is None:
+            angle = np.asarray(angle, dtype=float)
+            if vert == 3:
+                angle = -angle
+            cos, sin = np.cos(angle), np.sin(angle)
+            rotation = np.stack((np.stack((cos, -sin), axis=-1),
+                                 np.stack((sin,  cos), axis=-1)), axis=-2)
+        else:
+            rotation = np.asarray(rotation, dtype=float)
+
+        dirns = ("hor1", "hor2", "vert")[:rotation.shape[-1]]
+        for dirn in dirns:
+            if dirn not in self.components:
+                raise AttributeError("Attempt to rotate a vector that "\
+                        f"does not have a '{dirn}' component")
+        return rotation, self._columns(*dirns)
+
+    def _rotate_columns(self, rotation, columns, quantity):
+        # The components `columns` of `quantity` rotated by each matrix
+        # of `rotation`, in one matrix multiplication. Returns an array
+        # of shape (..., len(columns), npts), so that the rotated
+        # traces are contiguous, or None if `quantity` is missing.
+        buffer = self._buffer(quantity)
+        if buffer is None:
+            return None
+        data = _take_columns(buffer, columns)
+        # data.T is a C-contiguous (k, npts) view of the column-major
+        # buffer, so the product is a single BLAS call per matrix.
+        return np.matmul(rotation, data.T)
+
+    def rotate(self, angle=None, rotation=None, vert=None, inplace=True):
+        """
+        Rotate the horizontal components by ``angle`` (radians), or by
+        ``rotation``, a 2x2 matrix applied to 'hor1' and 'hor2' or a 3x3
+        matrix applied to 'hor1', 'hor2' and 'vert'. Each quantity is
+        rotated with one matrix multiplication of the shared buffer.
 
+        If ``inplace`` is True (the default), the data of this `Vector`
+        and its components are changed and the `Vector` is returned.
+        Otherwise a new, rotated `Vector` is returned.
 
-    @_update_components
-    def rotate(self, angle=None, rotation=None, vert=None):
-        """
-        > NOTE: This method changes data in the class instance.
+        ``angle`` may also be an array of angles, or ``rotation`` an
+        array of matrices, for a sweep of orientations; a list with one
+        new `Vector` for each angle is returned, all computed at once.
+
+        > NOTE: With ``inplace=True``, this method changes data in
+        > the class instance.
         """
+        rotation, columns = self._rotation(angle, rotation, vert)
+        batch = rotation.ndim == 3
 
-        if vert == 3:
-            angle *= -1
+        if inplace:
+            if batch:
+                raise ValueError("An array of angles can only be rotated with inplace=False.")
+            for attr in ["accel", "veloc", "displ"]:
+                rotated = self._rotate_columns(rotation, columns, attr)
+                if rotated is not None:
+                    # the components see the result through their views.
+                    self._buffer(attr)[:, columns] = rotated.T
+            return self
+
+        rotated = {attr: self._rotate_columns(rotation, columns, attr)
+                   for attr in ["accel", "veloc", "displ"]}
+        rotated = {attr: data for attr, data in rotated.items() if data is not None}
+
+        dirns = list(self.components)
+        vectors = []
+        for i in range(len(rotation) if batch else 1):
+            components = {}
+            for dirn, component in self.components.items():
+                if dirns.index(dirn) in columns:
+                    j = columns.index(dirns.index(dirn))
+                    data = {attr: values[i, j] if batch else values[j]
+                            for attr, values in rotated.items()}
+                else:
+                    data = {attr: getattr(component, attr) for attr in rotated}
+                components[dirn] = TimeSeries(**data, meta=MetaData(component.meta))
+            vectors.append(Vector(components, meta=MetaData(self.meta)))
 
-        rx, ry = (
-            np.array([[ np.cos(angle),-np.sin(angle)], 
-                      [ np.sin(angle), np.cos(angle)]])
-            if not rotation else rotation
-        )
+        return vectors if batch else vectors[0]
 
-        try:
-            for attr in ["accel", "veloc", "displ"]:
-                x = getattr(self.components["hor1"], attr).data
-                y = getattr(self.components["hor2"], attr).data
-                X = np.array([x, y])
-                x[:] = np.dot(rx, X)
-                y[:] = np.dot(ry, X)
+    def rotd(self, percentiles=(0, 50, 100), angles=None, quantity="accel",
+             response=None, **kwds):
+        """
+        Orientation-independent peaks of the horizontal components:
+        the ``percentiles`` over ``angles`` (radians, every degree from 0
+        to 179 by default) of the peak of ``quantity`` rotated to each
+        angle. All angles are computed together with
+        `evnt.param.rotd.rotd`, in chunks bounded by ``max_size``.
+
+        ``response`` may instead give oscillator outputs of the two
+        horizontal components, with shape ``(n_periods, 2, npts)``,
+        for the ordinates of a RotD response spectrum.
+
+        Returns a dictionary from ``'rotd{percentile:02}'`` (eg, 'rotd50')
+        to the peak, or to an array with one peak for each period.
+        """
+        from evnt.param.rotd import rotd
 
-        except KeyError as e:
-            raise AttributeError("Attempt to rotate a vector that"\
-                    f"does not have a '{e.args[0]}' component")
+        if response is None:
+            _, columns = self._rotation(rotation=np.eye(2))
+            buffer = self._buffer(quantity)
+            if buffer is None:
+                raise AttributeError(f"The components of this vector have no {quantity}.")
+            # (2, npts) view of the two columns of the buffer, or a
+            # copy when they are not adjacent
+            response = _take_columns(buffer, columns).T
 
-        return self
+        values = rotd(response, percentiles, angles, **kwds)
+        return {f"rotd{p:02g}": values[..., i][()] for i, p in enumerate(percentiles)}
 
     def resultant(self):
-        # initialize
-        vector_norm = {k:None for k in ("accel", "veloc", "displ")}
-        for typ in vector_norm:
-            try:
-                vector_norm[typ] = np.sqrt(sum(
-                    np.power(getattr(self.components[dirn],typ), 2)
-                    for dirn in ("hor1", "hor2", "vert")
-                        if  dirn in self.components and 
-                            self.components[dirn] is not None
-                ))
-            except AttributeError as e:
-                raise e
+        columns = self._columns(*(dirn for dirn in ("hor1", "hor2", "vert")
+                                  if self.components.get(dirn) is not None))
+        vector_norm = {}
+        for typ in ("accel", "veloc", "displ"):
+            buffer = self._buffer(typ)
+            if buffer is None:
+                vector_norm[typ] = None
+                continue
+            buffer = _take_columns(buffer, columns)
+            vector_norm[typ] = np.sqrt(np.einsum("ij,ij->i", buffer, buffer))
+
         return TimeSeries(*vector_norm.values())
 
 
 
 
+class _SeriesData:
+    """
+    Descriptor for the `.accel`, `.veloc` and `.displ` of a `TimeSeries`.
+    These may be set to a placeholder with a ``load`` method (eg, a
+    `FixedWidthBlock` from a lazy read), which is only called the
+    first time the data is accessed; the loaded array then replaces it.
+    The placeholder can be inspected without loading through ``vars``.
+    """
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        data = obj.__dict__.get(self.name)
+        if hasattr(data, "load"):
+            data = obj.__dict__[self.name] = data.load()
+        return data
+
+    def __set__(self, obj, value):
+        obj.__dict__[self.name] = value
+
+
+
+class TimeAxis:
+    """
+    Evenly spaced times ``t0 + i*dt`` for ``i`` in ``range(npts)``,
+    stored as the three numbers rather than an array.
+
+    Supports `len`, indexing (a number for an integer, a `TimeAxis`
+    for a slice, and an array for an array of indices), `searchsorted`
+    and `interp` without building the array of times. Wherever an
+    array is needed (eg, ``np.asarray(axis)`` or plotting), the array
+    is built once and shared, read-only, by every equal axis for as
+    long as it is in use.
+    """
+    __slots__ = ('t0', 'dt', 'npts')
+
+    def __init__(self, t0=0.0, dt=1.0, npts=0):
+        self.t0   = float(t0)
+        self.dt   = float(dt)
+        self.npts = int(npts)
+
+    def __repr__(self):
+        return f"TimeAxis(t0={self.t0}, dt={self.dt}, npts={self.npts})"
+
+    def __len__(self):
+        return self.npts
+
+    def __eq__(self, other):
+        if isinstance(other, TimeAxis):
+            return (self.t0, self.dt, self.npts) == (other.t0, other.dt, other.npts)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.t0, self.dt, self.npts))
+
+    def __iter__(self):
+        return iter(self.values)
+
+    @property
+    def values(self)->np.ndarray:
+        """The array of times; built on first use and shared."""
+        return _time_array(self.t0, self.dt, self.npts)
+
+    def __array__(self, dtype=None, copy=None):
+        values = self.values
+        if dtype is not None and np.dtype(dtype) != values.dtype:
+            return values.astype(dtype)
+        return values.copy() if copy else values
+
+    @property
+    def duration(self)->float:
+        return self.dt*max(self.npts - 1, 0)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.npts)
+            return TimeAxis(self.t0 + start*self.dt, step*self.dt, len(range(start, stop, step)))
+
+        index = np.asarray(key)
+        if index.dtype == bool:
+            index = np.flatnonzero(index)
+        if not np.issubdtype(index.dtype, np.integer):
+            raise IndexError("only integers, slices and integer or boolean arrays are valid indices")
+        if np.any((index < -self.npts) | (index >= self.npts)):
+            raise IndexError(f"index {key} is out of bounds for a time axis with {self.npts} points")
+        index = np.where(index < 0, index + self.npts, index)
+        times = self.t0 + index*self.dt
+        return float(times) if times.ndim == 0 else times
+
+    def searchsorted(self, t, side="left"):
+        """
+        Indices at which the times ``t`` would be inserted to keep the
+        axis sorted, as `np.searchsorted` of the array of times.
+        """
+        t = np.asarray(t, dtype=float)
+        n = self.npts
+        # Estimate from the spacing, then correct the rounding of the
+        # estimate by comparing with the times it points at.
+        index = np.clip(np.ceil((t - self.t0)/self.dt), 0, n).astype(np.intp)
+        at = lambda i: self.t0 + np.clip(i, 0, max(n - 1, 0))*self.dt
+        if side == "left":
+            # first index with time >= t
+            index = np.where((index > 0) & (at(index - 1) >= t), index - 1, index)
+            index = np.where((index < n) & (at(index) < t), index + 1, index)
+        elif side == "right":
+            # first index with time > t
+            index = np.where((index < n) & (at(index) <= t), index + 1, index)
+            index = np.where((index > 0) & (at(index - 1) > t), index - 1, index)
+        else:
+            raise ValueError(f"side must be 'left' or 'right', not {side!r}")
+        return index[()] if index.ndim == 0 else index
+
+    def interp(self, t, values, left=None, right=None):
+        """
+        Linear interpolation of ``values``, sampled at these times, at
+        the times ``t``; equivalent to ``np.interp(t, axis, values)``.
+        """
+        values = np.asarray(values)
+        if len(values) != self.npts:
+            raise ValueError(f"Expected {self.npts} values, not {len(values)}")
+        t = np.asarray(t, dtype=float)
+        x = (t - self.t0)/self.dt
+        i = np.clip(np.floor(x), 0, max(self.npts - 2, 0)).astype(np.intp)
+        if self.npts > 1:
+            frac = x - i
+            result = values[i]*(1 - frac) + values[i + 1]*frac
+        else:
+            result = np.broadcast_to(values[i], np.shape(x)).astype(float)
+        result = np.where(x < 0, values[0] if left is None else left, result)
+        result = np.where(x > self.npts - 1, values[-1] if right is None else right, result)
+        return result[()] if result.ndim == 0 else result
+
+
+# Arrays of times by (t0, dt, npts); an array is only kept while
+# something outside the cache still refers to it.
+_time_arrays = weakref.WeakValueDictionary()
+
+def _time_array(t0, dt, npts):
+    # Times of a `TimeAxis`, shared by every equal axis; read-only
+    # so that one series cannot change the times of another.
+    times = _time_arrays.get((t0, dt, npts))
+    if times is None:
+        times = t0 + dt*np.arange(npts)
+        times.flags.writeable = False
+        times = _time_arrays.setdefault((t0, dt, npts), times)
+    return times
+
+
+
 class TimeSeries:
     """
     Collects the acceleration (`.accel`), velocity (`.veloc`), and
     displacement (`.displ`) at a single component.
-    Initialized using at least one of accel, veloc, or displ.
+    Initialized using at least one of accel, veloc, or displ,
+    or, for a header-only summary, with only `meta`.
     """
+    accel = _SeriesData()
+    veloc = _SeriesData()
+    displ = _SeriesData()
 
     def __init__(self, accel=None, veloc=None, displ=None,
                  meta=None):
 
-        if not any(i is not None for i in (accel, veloc, displ)):
-            raise ValueError("One of accel, veloc or displ must be non-None")
+        if not any(i is not None for i in (accel, veloc, displ)) and meta is None:
+            raise ValueError("One of accel, veloc, displ or meta must be non-None")
         
-        self.meta = meta if meta is not None else MetaData(self)
+        self.meta = meta if meta is not None else MetaData()
         # possible items in meta:
         #   'npts': number of time samples
         #   'time_step': length of time step
@@ -273,8 +638,8 @@ class TimeSeries:
         self.veloc = veloc
         self.displ = displ
         
-        for data in (self.accel, self.veloc, self.displ):
-            if data is not None:
+        for data in (accel, veloc, displ):
+            if data is not None and not hasattr(data, "load"):
                 data = np.asarray(data)
                 assert data.ndim == 1
                 if self.meta.get('npts',None) is None:
@@ -291,23 +656,24 @@ class TimeSeries:
         
 
     @property
-    def time(self,**kwds):
-        if self._time is None:
-            npts = self.meta['npts']
-            if self.start_time is None:
-                if kwds.get('verbosity',0) >= 2:
-                    warnings.warn("No start time specified. Time array will begin at 0.0s.")
-                t0 = 0.0
-            else:
-                t0 = self.meta['start_time']
-            if self.time_step is None:
-                if kwds.get('verbosity',0) >= 2:
-                    warnings.warn("No timestep given. Time array will use 1s sampling time.")
-                self._time = np.arange(t0,t0+npts,1)
-            else:
-                dt = self.meta['time_step']
-                self._time = np.arange(t0,t0+dt*npts,dt)
-        return self._time
+    def time(self)->"TimeAxis":
+        """
+        The times of the samples, as a `TimeAxis` built from the
+        'start_time' (if it is a number of seconds; otherwise times
+        begin at 0.0s), 'time_step' (1s if not given) and 'npts' of
+        `.meta`. No array is allocated until one is needed, and series
+        with the same times share it.
+        """
+        npts = self.meta.get('npts', None)
+        if npts is None:
+            data = next((vars(self).get(attr) for attr in ('accel','veloc','displ')
+                         if vars(self).get(attr) is not None), None)
+            npts = len(data) if data is not None and not hasattr(data, "load") else 0
+        t0 = self.meta.get('start_time', None)
+        if not isinstance(t0, (int, float, np.number)):
+            t0 = 0.0
+        dt = self.meta.get('time_step', None)
+        return TimeAxis(t0, 1.0 if dt is None else dt, npts)
 
 
 class MetaData(dict):
@@ -315,30 +681,193 @@ class MetaData(dict):
     Collects metadata for objects with safe and coherent access
     through keys, properties, and attributes.
     """
-    # def __init__(self,**kwds):
-    #     dict.__init__(self,**kwds)  # TODO: is this right?
+    # Items are stored in the dict itself, so instances need no
+    # attribute dictionary of their own.
+    __slots__ = ()
 
     def __setattr__(self, name, value):
         self[name]  = value
-        
-    def __getattribute__(self, __name: str):
-        if __name in self:
+
+    def __getattr__(self, __name: str):
+        # Only called when normal attribute lookup fails, so that
+        # methods (eg, `.get`) are found without checking the items.
+        try:
             return self[__name]
-        return super().__getattribute__(__name)
+        except KeyError:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {__name!r}") from None
+
 
+# Default of lookups that distinguishes a missing item from None
+_UNSET = object()
 
-from evnt.parse import smc, v2, v2c
+
+class _SharedMeta(dict):
+    # Items shared by the `CompactMetaData` of many series;
+    # weakly referenced by `CompactMetaData._interned`.
+    __slots__ = ("__weakref__",)
+
+
+class CompactMetaData(MutableMapping):
+    """
+    Memory-compact metadata of a `TimeSeries`, with the same
+    dictionary and attribute access as `MetaData`.
+
+    The most common fields (`FIELDS`) are stored in slots; items
+    that have the same value for every series of a record (eg,
+    'station_name' and 'event_date') are kept in one shared, interned
+    mapping, and any other items in a small overflow dict. Setting a
+    shared item only changes it for this series.
+
+    Each lookup is a Python method call, so it is a few times slower
+    than a lookup in a `dict`; use ``dict(meta)`` for tight loops.
+
+    Created for every series of a `Record` by `Record.compact`.
+    """
+    FIELDS = (
+        'npts', 'time_step', 'station_channel', 'channel', 'component', 'location',
+        'peak_accel', 'peak_veloc', 'peak_displ',
+        'units_accel', 'units_veloc', 'units_displ',
+    )
+    __slots__ = FIELDS + ('_shared', '_extra')
+
+    # Shared mappings by their items, so that equal ones are stored once
+    _interned = weakref.WeakValueDictionary()
+
+    def __init__(self, items=(), shared=None):
+        object.__setattr__(self, '_extra', {})
+        object.__setattr__(self, '_shared', self._intern(shared or {}))
+        for key, value in dict(items).items():
+            self[key] = value
+
+    @classmethod
+    def _intern(cls, shared):
+        shared = {key: sys.intern(value) if type(value) is str else value
+                  for key, value in shared.items() if key not in cls.FIELDS}
+        try:
+            key = tuple(sorted(shared.items()))
+            hash(key)
+        except TypeError:
+            return _SharedMeta(shared)
+        interned = cls._interned.get(key)
+        if interned is None:
+            interned = cls._interned[key] = _SharedMeta(shared)
+        return interned
+
+    def __getitem__(self, key):
+        # Slots, then the items of this series, then the shared items;
+        # each with a single lookup.
+        if key in _COMPACT_SLOTS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        value = self._extra.get(key, _UNSET)
+        if value is _UNSET:
+            return self._shared[key]
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key, value):
+        if type(value) is str:
+            value = sys.intern(value)
+        slot = _COMPACT_SLOTS.get(key)
+        if slot is not None:
+            slot.__set__(self, value)
+        else:
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        slot = _COMPACT_SLOTS.get(key)
+        if slot is not None:
+            try:
+                slot.__delete__(self)
+            except AttributeError:
+                raise KeyError(key) from None
+            return
+        found = self._extra.pop(key, self) is not self
+        if key in self._shared:
+            # Stop sharing, rather than change the other series
+            object.__setattr__(self, '_shared', self._intern(
+                {k: v for k, v in self._shared.items() if k != key}))
+            found = True
+        if not found:
+            raise KeyError(key)
+
+    def __iter__(self):
+        for key in self.FIELDS:
+            if hasattr(self, key):
+                yield key
+        yield from self._extra
+        for key in self._shared:
+            if key not in self._extra:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, key):
+        slot = _COMPACT_SLOTS.get(key)
+        if slot is not None:
+            try:
+                slot.__get__(self)
+            except AttributeError:
+                return False
+            return True
+        return key in self._extra or key in self._shared
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
+    def __getattr__(self, name):
+        # Only called for names that are not set slots
+        if name in self.FIELDS or name.startswith('__'):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}") from None
+
+    def copy(self):
+        return CompactMetaData(self._own(), self._shared)
+
+    def _own(self):
+        # Items that are not shared
+        return {key: self[key] for key in self if key in self.FIELDS or key in self._extra}
+
+    def __reduce__(self):
+        return CompactMetaData, (self._own(), dict(self._shared))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+# Slot descriptors of the `CompactMetaData.FIELDS`, by name
+_COMPACT_SLOTS = {name: getattr(CompactMetaData, name) for name in CompactMetaData.FIELDS}
+
+
+# Parsers are named as 'module:function', and their modules
+# are only imported once a file of their type is found.
 EVENT_PARSING_FUNCTIONS = {
-    'v2': v2.read,
-    'v2c': v2c.read,
-    'smc': smc.read,
+    'v2': 'evnt.parse.v2:read',
+    'v2c': 'evnt.parse.v2c:read',
+    'smc': 'evnt.parse.smc:read',
 }
 SERIES_PARSING_FUNCTIONS = {
-    'v2': v2.read_record,
-    'v2c': v2c.read_record,
-    'smc': smc.read_record,
+    'v2': 'evnt.parse.v2:read_record',
+    'v2c': 'evnt.parse.v2c:read_record',
+    'smc': 'evnt.parse.smc:read_record',
 }
 
+def _load_parser(name):
+    import importlib
+    module, function = name.split(":")
+    return getattr(importlib.import_module(module), function)
+
 def get_parser(path_to_file,**kwds):
     """
     Returns the file type and parser to use on the files in the zip.
@@ -361,7 +890,7 @@ def get_parser(path_to_file,**kwds):
             for filetype, parse_function in EVENT_PARSING_FUNCTIONS.items():
                 # if found, return file type and corresponding parser
                 if any(Path(file).suffix.lower()==f".{filetype}" for file in readfile.namelist()):
-                    return filetype, parse_function     
+                    return filetype, _load_parser(parse_function)
                   
     # otherwise, assume it's an individual series file
     # and will be parsed into a `TimeSeries`
@@ -370,7 +899,7 @@ def get_parser(path_to_file,**kwds):
         for filetype, parse_function in SERIES_PARSING_FUNCTIONS.items():
             # if found, return file type and corresponding parser
             if path_to_file.suffix.lower()==f".{filetype}":
-                return filetype, parse_function   
+                return filetype, _load_parser(parse_function)
             
     # if not found, warn and return None for both file type and parser
     if kwds.get('verbosity',0)>=0:
@@ -383,12 +912,15 @@ def group_by_location(series):
     """
     A dictionary mapping unique locations to lists of `TimeSeries` objects.
 
-    :param series:     collection of `TimeSeries` objects
-    :type series:      iterable collection (list, tuple, set)
+    :param series:     collection of `TimeSeries` objects, or a `Record`,
+                       whose location index is used
+    :type series:      iterable collection (list, tuple, set), or `Record`
     
     :return:           ``motions``
     :rtype:            dictionary
     """    
+    if isinstance(series,Record):
+        return series.group_by('location')
     if not isinstance(series,(list,tuple,set)):
         raise TypeError("series must be a list, tuple, or set.")
     if not all(isinstance(s,TimeSeries) for s in series):
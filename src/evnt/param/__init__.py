@@ -0,0 +1,16 @@
+"""
+Parameters extracted from structural response. Submodules are
+imported when they are first accessed (eg, `evnt.param.stats`).
+"""
+
+_SUBMODULES = {"asce", "rotd", "stats"}
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        import importlib
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES)
@@ -1,12 +1,14 @@
-import matplotlib.pyplot as plt
 import numpy as np
 
-## Define default plot parameters for matplotlib
-plt.rcParams['font.size'] = 16
-plt.rcParams['axes.linewidth'] = 1.5
-plt.rcParams['figure.dpi'] = 300
-plt.rcParams['savefig.dpi'] = 300
-plt.rcParams['savefig.bbox'] = 'tight'
+## Default plot parameters for matplotlib, applied
+## only while plotting (see plot_approximate_fundamental_period)
+RC_PARAMS = {
+    'font.size': 16,
+    'axes.linewidth': 1.5,
+    'figure.dpi': 300,
+    'savefig.dpi': 300,
+    'savefig.bbox': 'tight',
+}
 
 ## approximate fundamental period parameters
 structure_parameters_dict = {
@@ -132,34 +134,38 @@ def approximate_fundamental_period(structure_type, height_in_meters, force_kind=
 
 ## Plot the approximate fundamental period for different structure types
 def plot_approximate_fundamental_period():
-    heights = np.arange(30, 220, 10)  # in meters
-
-    # Taipei 101's height and approximate fundamental period
-    taipei_101_height = 508  # in meters
-    taipei_101_T = approximate_fundamental_period('reinforced_concrete_moment_resisting_frame', taipei_101_height)
-    print(f"Taipei 101's approximate fundamental period: {taipei_101_T:.2f} seconds")
-
-    # Plot the approximate fundamental period for each structure type
-    fig, ax = plt.subplots(2, 1, figsize=(12, 6), sharex=True)
-
-    for i, force_kind in enumerate(['seismic', 'wind']):
-        for j, structure_type in enumerate(structure_parameters_dict[force_kind].keys()):
-            T_values = [approximate_fundamental_period(structure_type, h, force_kind=force_kind) for h in heights]
-            structure_label = structure_type.replace('_', ' ').title()
-            structure_color = f"C{j}"
-            print(f"-- Plotting {structure_label}: {structure_color}")
-            ax[i].plot(heights, 1 / np.array(T_values), label=structure_label, lw=1.5)  # frequency
-
-            # Set the labels and title
-            ax[i].legend(loc='upper left', bbox_to_anchor=(1.05, 1), fancybox=True, shadow=True)
-            ax[i].grid(True)
-        ax[i].set_title(f"Force Kind: {force_kind.title()}".title())
-
-    fig.text(0.04, 0.5, 'F0 (Hz)', va='center', rotation='vertical', fontsize=16)
-    ax[1].set_xlabel('Height (meters)')
-    outfig = 'approximate_fundamental_frequency.png'
-    plt.savefig(outfig, dpi=300, bbox_inches='tight')
-    print(f"Plot saved as {outfig}")
+    import matplotlib.pyplot as plt
+
+    with plt.rc_context(RC_PARAMS):
+        heights = np.arange(30, 220, 10)  # in meters
+
+        # Taipei 101's height and approximate fundamental period
+        taipei_101_height = 508  # in meters
+        taipei_101_T = approximate_fundamental_period('reinforced_concrete_moment_resisting_frame', taipei_101_height)
+        print(f"Taipei 101's approximate fundamental period: {taipei_101_T:.2f} seconds")
+
+        # Plot the approximate fundamental period for each structure type
+        fig, ax = plt.subplots(2, 1, figsize=(12, 6), sharex=True)
+
+        for i, force_kind in enumerate(['seismic', 'wind']):
+            for j, structure_type in enumerate(structure_parameters_dict[force_kind].keys()):
+                T_values = [approximate_fundamental_period(structure_type, h, force_kind=force_kind) for h in heights]
+                structure_label = structure_type.replace('_', ' ').title()
+                structure_color = f"C{j}"
+                print(f"-- Plotting {structure_label}: {structure_color}")
+                ax[i].plot(heights, 1 / np.array(T_values), label=structure_label, lw=1.5)  # frequency
+
+                # Set the labels and title
+                ax[i].legend(loc='upper left', bbox_to_anchor=(1.05, 1), fancybox=True, shadow=True)
+                ax[i].grid(True)
+            ax[i].set_title(f"Force Kind: {force_kind.title()}".title())
+
+        fig.text(0.04, 0.5, 'F0 (Hz)', va='center', rotation='vertical', fontsize=16)
+        ax[1].set_xlabel('Height (meters)')
+        outfig = 'approximate_fundamental_frequency.png'
+        plt.savefig(outfig, dpi=300, bbox_inches='tight')
+        print(f"Plot saved as {outfig}")
+
 
 if __name__ == "__main__":
     # Plot the approximate fundamental period
@@ -0,0 +1,47 @@
+import numpy as np
+
+## Angles, in radians, of the default orientation sweep; rotations by
+## 180 degrees or more only change the sign of the traces.
+ANGLES = np.radians(np.arange(180))
+
+def rotd(data, percentiles=(0, 50, 100), angles=None, max_size=2**22):
+    """
+    Compute orientation-independent peaks (RotD) of a pair of
+    horizontal traces: the percentiles, over ``angles``, of the peak
+    absolute value of the traces projected onto each orientation.
+
+    ``data`` has shape ``(..., 2, npts)``, with the two horizontal
+    components along the second to last axis. Leading axes are computed
+    together, eg, the responses of a set of oscillators
+    (``(n_periods, 2, npts)``) for the RotD response spectrum.
+
+    Parameters:
+    - percentiles: Percentiles of the peaks over all angles; 0, 50
+      and 100 give RotD00, RotD50 and RotD100.
+    - angles: Orientations in radians. Defaults to `ANGLES`, every
+      degree from 0 to 179.
+    - max_size: Largest number of elements of the projected traces
+      held in memory at once; the angles are processed in chunks so
+      that the work array is no larger than this.
+
+    Returns an array with shape ``(..., len(percentiles))``.
+    """
+    data = np.asarray(data, dtype=float)
+    if data.ndim < 2 or data.shape[-2] != 2:
+        raise ValueError(f"Expected data of shape (..., 2, npts), not {data.shape}")
+    angles = ANGLES if angles is None else np.atleast_1d(np.asarray(angles, dtype=float))
+
+    # Unit vectors of each orientation, shape (n_angles, 2)
+    directions = np.stack((np.cos(angles), np.sin(angles)), axis=-1)
+
+    leading, npts = data.shape[:-2], data.shape[-1]
+    chunk = max(1, int(max_size // max(1, npts*int(np.prod(leading)))))
+
+    peaks = np.empty(leading + (len(angles),))
+    for start in range(0, len(angles), chunk):
+        # (chunk, 2) @ (..., 2, npts) -> (..., chunk, npts)
+        projected = np.matmul(directions[start:start+chunk], data)
+        # max |x| without a temporary array for |x|
+        peaks[..., start:start+chunk] = np.maximum(projected.max(axis=-1), -projected.min(axis=-1))
+
+    return np.percentile(peaks, percentiles, axis=-1).transpose(*range(1, len(leading)+1), 0)
@@ -0,0 +1,240 @@
+import numpy as np
+
+## Statistics computed by `stats`, in the order of the columns of
+## the waveform statistics table (Scripts/waveform_stats.csv)
+STATISTICS = (
+    'mean',
+    'standard_deviation',
+    'rms',
+    'pga',
+    'skewness',
+    'kurtosis',
+    'zero_crossing_rate',
+    'cav',
+)
+
+## Statistics that are only computed when requested
+OPTIONAL_STATISTICS = (
+    'arias_intensity',
+)
+
+## Statistics that depend on the sampling rate
+RATE_STATISTICS = (
+    'zero_crossing_rate',
+    'cav',
+    'arias_intensity',
+)
+
+g_conversion = 9.81  # Convert g to m/s²
+
+def stats(data, fs, which=None, envelope_window=50, lengths=None):
+    """
+    Compute waveform statistics of ``data``, sampled at ``fs`` Hz,
+    sharing the intermediate arrays between statistics so that each
+    is computed in one or two passes over the data.
+
+    ``data`` may be a single trace, or an array of traces with
+    shape ``(n_channels, npts)``; the statistics of all traces are
+    then computed together, along the last axis.
+
+    Parameters:
+    - which: Names of the statistics to compute, from `STATISTICS`
+      and `OPTIONAL_STATISTICS`. Defaults to `STATISTICS`.
+    - envelope_window: Number of points averaged to smooth the envelope
+      from which skewness and kurtosis are computed.
+    - lengths: For padded traces, the number of samples of each trace;
+      only the first ``lengths[i]`` samples of trace ``i`` are used.
+
+    Returns a dictionary of the requested statistics, each a number
+    for a single trace or an array with one value for each trace.
+    """
+    which = STATISTICS if which is None else tuple(which)
+    unknown = set(which) - set(STATISTICS) - set(OPTIONAL_STATISTICS)
+    if unknown:
+        raise ValueError(f"Unknown statistics {sorted(unknown)}; "
+                         f"expected some of {STATISTICS + OPTIONAL_STATISTICS}")
+
+    data = np.asarray(data, dtype=float)
+
+    if lengths is not None:
+        # Traces of equal length are computed together
+        lengths = np.asarray(lengths, dtype=int)
+        out = {name: np.full(len(data), np.nan) for name in which}
+        for length in np.unique(lengths):
+            rows = np.flatnonzero(lengths == length)
+            values = stats(data[rows, :length], fs, which, envelope_window)
+            for name in which:
+                out[name][rows] = values[name]
+        return out
+
+    n = data.shape[-1]
+    dt = 1/fs
+    out = {}
+
+    # Moments; the mean square about the mean gives both the
+    # standard deviation and, with the mean, the RMS.
+    if {'mean', 'standard_deviation', 'rms'} & set(which):
+        mean = data.mean(axis=-1)
+        deviation = data - mean[..., None]
+        variance = np.einsum('...i,...i->...', deviation, deviation) / n
+        out['mean'] = mean
+        out['standard_deviation'] = np.sqrt(variance)
+        out['rms'] = np.sqrt(variance + mean*mean)
+
+    # Peaks; |a(t)| is shared by the PGA and CAV
+    if {'pga', 'cav'} & set(which):
+        magnitude = np.abs(data)
+        out['pga'] = magnitude.max(axis=-1)
+        if 'cav' in which:
+            out['cav'] = _cav_intervals(magnitude, fs).sum(axis=-1)
+
+    if 'zero_crossing_rate' in which:
+        sign = np.sign(data)
+        crossings = np.count_nonzero(sign[..., 1:] != sign[..., :-1], axis=-1)
+        out['zero_crossing_rate'] = crossings / (n / fs)
+
+    # Arias intensity, pi/2g times the integral of a(t)^2
+    if 'arias_intensity' in which:
+        square = np.einsum('...i,...i->...', data, data)
+        square -= 0.5*(data[..., 0]**2 + data[..., -1]**2)
+        out['arias_intensity'] = np.pi/(2*g_conversion) * dt*square
+
+    # Shape of the envelope
+    if {'skewness', 'kurtosis'} & set(which):
+        smooth = envelope(data, envelope_window)
+        deviation = smooth - smooth.mean(axis=-1)[..., None]
+        square = deviation*deviation
+        # the envelope has more than n points when the trace is
+        # shorter than the window
+        m = smooth.shape[-1]
+        m2 = square.mean(axis=-1)
+        out['skewness'] = np.einsum('...i,...i->...', square, deviation) / m / m2**1.5
+        out['kurtosis'] = np.einsum('...i,...i->...', square, square) / m / m2**2 - 3.0
+
+    # Return numbers, rather than 0-d arrays, for a single trace
+    return {name: np.asarray(out[name])[()] for name in which}
+
+
+def record_stats(record, which=None, quantity='accel', **kwds):
+    """
+    Compute waveform statistics for every channel of a `Record`.
+    Channels with the same number of points and time step are
+    computed together with `stats`.
+
+    Acceleration in cm/s² (the units of the CSMIP and NSMP formats)
+    is converted to m/s², the units assumed by the CAV threshold and
+    the Arias intensity.
+
+    Returns a ``pandas.DataFrame`` with one row for each channel,
+    indexed by ``station_channel``. The `RATE_STATISTICS` of channels
+    without a ``time_step`` are NaN.
+    """
+    import pandas as pd
+
+    which = STATISTICS if which is None else tuple(which)
+
+    series = [s for s in record.series if getattr(s, quantity) is not None]
+    groups = {}
+    for i, s in enumerate(series):
+        key = (len(getattr(s, quantity)), s.meta.get('time_step'))
+        groups.setdefault(key, []).append(i)
+
+    values = {name: np.full(len(series), np.nan) for name in which}
+    for (npts, time_step), rows in groups.items():
+        data = np.stack([getattr(series[i], quantity) for i in rows])
+        units = str(series[rows[0]].meta.get(f'units_{quantity}', 'cm'))
+        if quantity == 'accel' and units.startswith('cm'):
+            data = data/100
+        if time_step:
+            names, fs = which, 1/time_step
+        else:
+            names, fs = [name for name in which if name not in RATE_STATISTICS], np.nan
+        if not names:
+            continue
+        for name, value in stats(data, fs, names, **kwds).items():
+            values[name][rows] = value
+
+    table = pd.DataFrame({
+        'station_channel': [s.meta.get('station_channel') for s in series],
+        'component': [s.meta.get('component') for s in series],
+        'location': [s.meta.get('location') for s in series],
+        'npts': [len(getattr(s, quantity)) for s in series],
+        'time_step': [s.meta.get('time_step') for s in series],
+        **values
+    })
+    return table.set_index('station_channel')
+
+
+def envelope(data, window_size=50):
+    """
+    Compute the envelope of ``data`` using the Hilbert transform,
+    smoothed by a centered moving average of ``window_size`` points
+    (equivalent to ``np.convolve(..., mode='same')`` with a uniform
+    kernel, computed from a cumulative sum). Traces are along the
+    last axis.
+    """
+    from scipy.signal import hilbert
+    amplitude = np.abs(hilbert(data, axis=-1))
+    n = amplitude.shape[-1]
+    if window_size <= 1 or n == 0:
+        return amplitude
+
+    # Moving sums over the full convolution, then the centered
+    # part that mode='same' keeps; like np.convolve, this has
+    # window_size points when the trace is shorter than the window.
+    total = np.cumsum(amplitude, axis=-1)
+    total = np.concatenate((np.zeros(total.shape[:-1] + (1,)), total), axis=-1)
+    full = np.arange(n + window_size - 1)
+    sums = total[..., np.minimum(full + 1, n)] - total[..., np.maximum(full + 1 - window_size, 0)]
+    start = (min(n, window_size) - 1) // 2
+    return sums[..., start:start + max(n, window_size)] / window_size
+
+
+def cav(data, fs, window=1.0, threshold=0.025, standardized=True, return_windows=False):
+    """
+    Compute the standardized CAV based on the EPRI 2006 equation.
+    Only intervals with PGA > 0.025g contribute to the CAV.
+    ``data`` is the acceleration in m/s², sampled at ``fs`` Hz.
+
+    Parameters:
+    - window: Length of each interval, in seconds. A trailing partial
+      interval is not included.
+    - threshold: PGA, in g, that an interval must exceed to contribute
+      to the standardized CAV.
+    - standardized: If False, every interval contributes (plain CAV).
+    - return_windows: If True, also return the contribution of each
+      interval.
+    """
+    contributions = _cav_intervals(np.abs(np.asarray(data)), fs, window, threshold, standardized)
+
+    cav = contributions.sum(axis=-1)[()]
+    cav = float(cav) if np.ndim(cav) == 0 else cav
+    if return_windows:
+        return cav, contributions
+    return cav
+
+
+def _cav_intervals(magnitude, fs, window=1.0, threshold=0.025, standardized=True):
+    # Contribution of each interval to the CAV of |a(t)| = magnitude,
+    # along the last axis
+    cav_threshold = threshold * g_conversion  # threshold in m/s²
+
+    # Number of samples per interval
+    samples_per_window = int(window * fs)
+    num_intervals = magnitude.shape[-1] // samples_per_window
+    dt = 1/fs
+
+    # One row of |a(t)| for each interval
+    intervals = magnitude[..., :num_intervals*samples_per_window]
+    intervals = intervals.reshape(*magnitude.shape[:-1], num_intervals, samples_per_window)
+
+    # Trapezoidal integral of |a(t)| over each interval
+    contributions = dt*(intervals.sum(axis=-1) - 0.5*(intervals[..., 0] + intervals[..., -1]))
+
+    if standardized:
+        # Peak Ground Acceleration (PGA) in each interval; use a
+        # mask instead of the Heaviside function of (PGA - 0.025g)
+        pga = intervals.max(axis=-1, initial=0.0)
+        contributions[pga <= cav_threshold] = 0.0
+
+    return contributions
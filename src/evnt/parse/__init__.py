@@ -0,0 +1,16 @@
+"""
+Parsers for strong motion data formats. Each parser is imported
+when it is first accessed (eg, `evnt.parse.v2`).
+"""
+
+_SUBMODULES = {"v2", "v2c", "smc", "native", "compute_params"}
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        import importlib
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES)
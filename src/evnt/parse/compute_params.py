@@ -1,29 +1,65 @@
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import glob, os
-from datetime import datetime, timedelta 
-from evnt.param.asce import get_min_max_freq_range
-import multitaper.mtspec as spec
-import matplotlib.dates as mdates
-from scipy.interpolate import interp1d 
-from scipy.signal import hilbert
-from scipy.stats import skew, kurtosis
+import os
+from evnt.param import stats as waveform_stats
 import zipfile
-from gmprocess.io.dmg.core import read_dmg
 import tempfile
+import contextlib
 import logging
 
-# Set the logging level to ERROR to suppress WARNING messages
-logging.getLogger().setLevel(logging.ERROR)
+# gmprocess and scipy.stats are imported where they are used, and
+# no logging or plotting settings are changed on import.
+
+
+@contextlib.contextmanager
+def _log_level(level):
+    """
+    Set the level of the root logger while reading, eg to ERROR
+    to suppress WARNING messages from gmprocess.
+    """
+    logger = logging.getLogger()
+    previous = logger.level
+    logger.setLevel(level)
+    try:
+        yield
+    finally:
+        logger.setLevel(previous)
+
+
+@contextlib.contextmanager
+def _member_path(zip_obj, name):
+    """
+    A path from which the member ``name`` of ``zip_obj`` can be read
+    by functions that only accept file names (such as gmprocess'
+    ``read_dmg``). Where possible (Linux), the member is decompressed
+    into an anonymous in-memory file rather than written to disk.
+    """
+    data = zip_obj.read(name)
+    fd = None
+    if hasattr(os, "memfd_create") and os.path.isdir("/proc/self/fd"):
+        try:
+            fd = os.memfd_create(os.path.basename(name))
+            with os.fdopen(fd, "wb", closefd=False) as f:
+                f.write(data)
+        except OSError:
+            # eg, refused by a sandbox or out of memory; use a
+            # temporary file instead
+            if fd is not None:
+                os.close(fd)
+            fd = None
+
+    if fd is not None:
+        try:
+            yield f"/proc/self/fd/{fd}"
+        finally:
+            os.close(fd)
+    else:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, os.path.basename(name))
+            with open(path, "wb") as f:
+                f.write(data)
+            yield path
 
-plt.style.use('ggplot')
 
-# plt.rcParams.update({'font.size': 22})
-plt.rcParams.update({'font.size': 16})
-    
-
-    
 class StructuralWaveforms:
     available_formats = ('.V1','.V2','.V3')
     
@@ -60,17 +96,18 @@ class StructuralWaveforms:
             # Get the first channel file from the zip
             channel_file = self.get_all_channel_files()[0]
 
+        from gmprocess.io.dmg.core import read_dmg
+
         try:
-            # Extract the channel file to a temporary location
-            with tempfile.TemporaryDirectory() as temp_dir:
-                extracted_path = os.path.join(temp_dir, channel_file)
-                
-                # Extract the file
-                with open(extracted_path, 'wb') as extracted_file:
-                    extracted_file.write(self.zip_obj.read(channel_file))
-                
-                # Read the extracted file using read_dmg
+            # Decompress the channel file to memory, and read it using read_dmg
+            with _member_path(self.zip_obj, channel_file) as extracted_path, \
+                 _log_level(logging.ERROR):
                 strm = read_dmg(extracted_path, config=None, units=units)
+
+            # read_dmg names the source after the path it was given
+            for stream in strm:
+                for trace in stream:
+                    trace.stats['standard']['source_file'] = os.path.basename(channel_file)
         except BaseException as e:
             # Catch the specific error related to the DMG header and continue
             if "DMG: Not enough information to distinguish horizontal from vertical channels" in str(e):
@@ -133,21 +170,13 @@ class StructuralWaveforms:
             instrument_period = trace[0].stats['standard']['instrument_period']
             instrument_damping = trace[0].stats['standard']['instrument_damping']
 
-            # Compute the waveform statistics
-            mean = self.compute_mean(data)
-            standard_deviation = self.compute_standard_deviation(data)
-            rms = self.compute_rms(data)
-            pga = self.compute_pga(data)
-            envelope = self.compute_envelope(data)
-            skewness = self.compute_skewness(envelope)
-            kurtosis = self.compute_kurtosis(envelope)
-
             # sampling_rate
             self.sampling_frequency = trace[0].stats['sampling_rate']
 
-            #cav
-            zero_crossing_rate = self.compute_zero_crossing_rate(data)
-            cav = self.compute_cav(data)
+            # Compute the waveform statistics (mean, standard deviation,
+            # rms, pga, skewness, kurtosis, zero crossing rate and cav)
+            # together, sharing intermediate arrays
+            statistics = waveform_stats.stats(data, self.sampling_frequency)
 
             # units_type
             units_type = trace[0].stats['standard']['units_type']
@@ -183,14 +212,7 @@ class StructuralWaveforms:
                 'instrument_damping': instrument_damping,
 
                 # waveform statistics
-                'mean': mean,
-                'standard_deviation': standard_deviation,
-                'rms': rms,
-                'pga': pga,
-                'skewness': skewness,
-                'kurtosis': kurtosis,
-                'zero_crossing_rate': zero_crossing_rate,
-                'cav': cav,
+                **statistics,
 
                 # orientation
                 'horizontal_orientation': horizontal_orientation,
@@ -211,33 +233,24 @@ class StructuralWaveforms:
         """
         return np.max(np.abs(interval_data))  # Peak absolute acceleration
     
-    def compute_cav(self, data):
+    def compute_cav(self, data, window=1.0, threshold=0.025, standardized=True,
+                    return_windows=False):
         """
         Compute the standardized CAV based on the EPRI 2006 equation.
         Only intervals with PGA > 0.025g contribute to the CAV.
-        """
-        g_conversion = 9.81  # Convert g to m/s²
-        cav_threshold = 0.025 * g_conversion  # 0.025g in m/s²
 
-        # Number of samples per 1-second interval
-        samples_per_second = int(self.sampling_frequency)
-        num_intervals = len(data) // samples_per_second
-
-        cav = 0.0
-
-        for i in range(num_intervals):
-            # Get the data for this 1-second interval
-            interval_data = data[i * samples_per_second:(i + 1) * samples_per_second]
-
-            # Compute the Peak Ground Acceleration (PGA) in this interval
-            pga = self.compute_pga_interval(interval_data)
-
-            # Apply the Heaviside function to the condition (PGA - 0.025g)
-            if pga > cav_threshold: # use conditional instead of Heaviside function
-                # If PGA > 0.025g, compute the integral of |a(t)| over the interval
-                cav += np.trapz(np.abs(interval_data), dx=1/self.sampling_frequency)
-
-        return cav
+        Parameters:
+        - window: Length of each interval, in seconds. A trailing partial
+          interval is not included.
+        - threshold: PGA, in g, that an interval must exceed to contribute
+          to the standardized CAV.
+        - standardized: If False, every interval contributes (plain CAV).
+        - return_windows: If True, also return the contribution of each
+          interval.
+        """
+        return waveform_stats.cav(data, self.sampling_frequency, window=window,
+                                  threshold=threshold, standardized=standardized,
+                                  return_windows=return_windows)
     
     def compute_zero_crossing_rate(self, data):
         """
@@ -285,25 +298,20 @@ class StructuralWaveforms:
         Parameters:
         - window_size: Number of points to average for smoothing.
         """
-        # Compute the envelope using the Hilbert transform
-        analytic_signal = hilbert(data)
-        envelope = np.abs(analytic_signal)
-        
-        # Apply a moving average for smoothing
-        smooth_envelope = np.convolve(envelope, np.ones(window_size)/window_size, mode='same')
-        
-        return smooth_envelope
+        return waveform_stats.envelope(data, window_size)
 
     def compute_skewness(self, envelope):
         """
         Compute the skewness of the waveform envelope.
         """
+        from scipy.stats import skew
         return skew(envelope)
 
     def compute_kurtosis(self, envelope):
         """
         Compute the kurtosis of the waveform envelope.
         """
+        from scipy.stats import kurtosis
         return kurtosis(envelope)
 
 
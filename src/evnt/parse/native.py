@@ -0,0 +1,176 @@
+"""
+Read and write evnt's own archive format (``.evnt``), which holds
+the records of a station as contiguous typed arrays and a metadata
+index, so that their series can be memory-mapped rather than parsed.
+
+Layout of a file:
+
+    MAGIC                   8 bytes
+    arrays                  each aligned to ALIGN bytes, little-endian
+    index                   JSON, utf-8
+    footer                  index offset and length (2 x uint64 LE), MAGIC
+
+The index lists, for each record, its metadata and, for each of its
+series, the metadata and the ``(offset, length, dtype)`` of its
+arrays. Records are appended by writing their arrays and a new index
+after the old footer, and then the new footer. The old index is left
+in place, so that if an append is interrupted, the file can still be
+read from the last complete footer.
+"""
+import os
+import json
+import mmap
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from evnt.core import Record, TimeSeries, MetaData
+from evnt.utils.processing import encode_meta, decode_meta
+
+MAGIC  = b"EVNTARC1"
+ALIGN  = 64
+FOOTER = struct.Struct("<QQ8s")
+SERIES_DATA = ("accel", "veloc", "displ")
+
+
+def write(write_file, records):
+    """
+    Write ``records`` to a new archive at ``write_file``,
+    replacing any existing file.
+
+    :param records:     a `Record`, or an iterable of them
+    """
+    with open(write_file, "wb") as f:
+        f.write(MAGIC)
+        _write_records(f, [], records)
+
+
+def append(write_file, records):
+    """
+    Add ``records`` to the end of the archive at ``write_file``,
+    creating it if it does not exist.
+    """
+    if not Path(write_file).exists():
+        return write(write_file, records)
+
+    with open(write_file, "r+b") as f:
+        index, _ = _read_index(f)
+        f.seek(0, 2)
+        _write_records(f, index["records"], records)
+
+
+def read(read_file, **kwds) -> list:
+    """
+    Read the records in an archive. The series data are views of
+    a copy-on-write memory map of the file, so they are only paged
+    in from disk as they are used, and modifying them does not
+    change the file.
+
+    :return:    records in the order they were written
+    :rtype:     list of `Record`
+    """
+    with open(read_file, "rb") as f:
+        index, _ = _read_index(f)
+
+    if not index["records"]:
+        return []
+
+    buffer = np.memmap(read_file, dtype=np.uint8, mode="c")
+
+    def load(location):
+        offset, length, dtype = location
+        return buffer[offset:offset+length].view(dtype)
+
+    return [
+        Record([
+            TimeSeries(**{attr: load(location) for attr, location in item["data"].items()},
+                       meta=MetaData(decode_meta(item["meta"], lambda name: load(item["arrays"][name]))))
+            for item in record["series"]
+        ], meta=MetaData(decode_meta(record["meta"], lambda name: load(record["arrays"][name]))))
+        for record in index["records"]
+    ]
+
+
+def _read_index(f):
+    f.seek(0)
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError(f"{f.name} is not an evnt archive")
+
+    size = f.seek(0, 2)
+    index = _index_at(f, size)
+    if index is None:
+        index = _recover_index(f)
+    if index is None:
+        raise ValueError(f"{f.name} is incomplete or corrupt")
+    return index
+
+
+def _index_at(f, end):
+    # The index of the footer that ends at byte `end`, and its
+    # offset, or None if there is no valid footer there.
+    if end < len(MAGIC) + FOOTER.size:
+        return None
+    f.seek(end - FOOTER.size)
+    offset, length, magic = FOOTER.unpack(f.read(FOOTER.size))
+    if magic != MAGIC or offset + length != end - FOOTER.size:
+        return None
+    f.seek(offset)
+    try:
+        return json.loads(f.read(length).decode("utf-8")), offset
+    except ValueError:
+        return None
+
+
+def _recover_index(f):
+    # The last complete footer, when an append was interrupted
+    # before its footer was written
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        end = len(data)
+        while True:
+            end = data.rfind(MAGIC, len(MAGIC), end)
+            if end < 0:
+                return None
+            index = _index_at(f, end + len(MAGIC))
+            if index is not None:
+                return index
+
+
+def _write_array(f, value) -> list:
+    value = np.asarray(value)
+    value = np.ascontiguousarray(value, dtype=value.dtype.newbyteorder("<"))
+    f.write(b"\0"*(-f.tell() % ALIGN))
+    offset = f.tell()
+    f.write(value.tobytes())
+    return [offset, value.nbytes, value.dtype.str]
+
+
+def _write_records(f, entries: list, records):
+    if isinstance(records, Record):
+        records = [records]
+
+    for record in records:
+        arrays = {}
+        entry  = {"meta": encode_meta(record.meta, arrays), "series": []}
+        entry["arrays"] = {name: _write_array(f, value) for name, value in arrays.items()}
+
+        for series in record.series:
+            arrays = {}
+            item = {"meta": encode_meta(series.meta, arrays), "data": {}}
+            item["arrays"] = {name: _write_array(f, value) for name, value in arrays.items()}
+            for attr in SERIES_DATA:
+                value = getattr(series, attr)
+                if value is not None:
+                    item["data"][attr] = _write_array(f, value)
+            entry["series"].append(item)
+
+        entries.append(entry)
+
+    offset = f.tell()
+    index  = json.dumps({"version": 1, "records": entries}).encode("utf-8")
+    f.write(index)
+    # The arrays and index are on disk before the footer that
+    # points to them is written.
+    f.flush()
+    os.fsync(f.fileno())
+    f.write(FOOTER.pack(offset, len(index), MAGIC))
@@ -7,17 +7,22 @@ https://escweb.wr.usgs.gov/nsmp-data/smcfmt.html
 import sys
 import zipfile
 import warnings
+from os import PathLike
 from pathlib import Path
+from datetime import datetime
 from collections import defaultdict
 
 import numpy as np
 
-from evnt.utils.parseutils import open_quake
+from evnt.utils.parseutils import (
+    open_quake, read_fixed_width, decode_fixed_width, iter_fixed_width, map_members, FixedWidthBlock
+)
 
 from evnt.core import (
      Record,
      Vector,
-     TimeSeries
+     TimeSeries,
+     MetaData
 )
 
 # TODO: A utility to convert general strings into
@@ -25,156 +30,188 @@ from evnt.core import (
 # it should be imported from a common utility module.
 _make_key = lambda strng: strng.strip().replace(" ", "_").lower()
 
-# def read(file)->"":
-#     pass
+# Series type of each file, from the end of its name.
+SERIES_TYPES = {
+    "a.smc": "accel",
+    "v.smc": "veloc",
+    "d.smc": "displ",
+}
+
+# Data in smc files are always in centimeters and seconds.
+UNITS = {
+    "accel": "cm/sec/sec",
+    "veloc": "cm/sec",
+    "displ": "cm",
+}
+
+# Decode a line of a file that may have been opened in binary mode.
+_decode = lambda line: line.decode() if isinstance(line, bytes) else line
 
+# Whether a `TimeSeries` from `read_series` holds corrected data.
+_is_corrected = lambda series: "uncorrected" not in series.meta["type"].lower()
 
-def read(read_file, verbosity=0, summarize=False, **kwds)->Record:
+
+def read(read_file, verbosity=0, summarize=False, workers=None, **kwds)->Record:
     """
+    Take the name of a NSMP smc zip file and extract record data for the event.
+    The _a.smc, _v.smc and _d.smc files of each channel are collected
+    into a single `TimeSeries`.
+
+    If ``workers`` is given, the files in the archive are decompressed
+    and decoded over that many threads; they are collected in the order
+    of the archive either way.
     """
 
     zippath    = Path(read_file)
     archive    = zipfile.ZipFile(zippath)
-    file_data = defaultdict(lambda : defaultdict(dict))
+    file_data  = {}
 
+    # Disregard any files that are not .smc
+    files = [file for file in archive.namelist() if file.endswith(".smc")]
 
-    # Loop over files in the zipped archive
-    for file in archive.namelist():
-
-        # Disregard any files that are not .smc
-        if not file.endswith(".smc"):
-            continue
-
+    def read_member(file):
         # Optional info logging
         if verbosity > 2:
             print(f"\t\t{file}", file=sys.stderr)
 
-        series, motion_data = read_series(file, archive, verbosity=verbosity,
-                                          summarize=summarize, **kwds)
-        
+        return read_series(file, archive, verbosity=verbosity,
+                           summarize=summarize, **kwds)
+
+    # Loop over files in the zipped archive
+    for file, (series, motion_data) in zip(files, map_members(read_member, files, workers)):
+
         if verbosity > 2:
             print(f"\t{motion_data['location_name']}")
 
-        stype = file.split("_")[-1]
-        stype = {
-            "a.smc": "accel",
-            "d.smc": "displ",
-            "v.smc": "veloc",
-        }[stype]
+        stype = SERIES_TYPES[file.split("_")[-1]]
 
-        component = file_data[motion_data["location_name"]][motion_data["component"]]
+        _, channel = file_data.setdefault(motion_data["station_channel"], (motion_data, {}))
 
-        if stype in component and "corrected" in component[stype]["type"].lower():
+        if stype in channel and _is_corrected(channel[stype]):
             # If we already have the corrected values, pass
             if verbosity > 2:
-                print(f"\t\t\tskipping component {component}", file=sys.stderr)
+                print(f"\t\t\tskipping {file}", file=sys.stderr)
         else:
-            if stype in component:
-                if verbosity > 1:
-                    warnings.warn(f"possibly overwritten channel at ")
-                
-                # Find a new unique location name for the motion
-                while motion_data["location_name"] in file_data:
-                    motion_data["location_name"] += "_anothaone"
-
-                component = file_data[motion_data["location_name"]][motion_data["component"]]
-
-            component[stype] = series
-            component["station_channel"] = motion_data["station_channel"]
-            component["file_name"] = file
+            if stype in channel and verbosity > 1:
+                warnings.warn(f"possibly overwritten channel {motion_data['station_channel']} at {file}")
+
+            channel[stype] = series
             if verbosity > 2:
-                print(f"\t\t\tadded component {component}", file=sys.stderr)
-
-
-    date = None
-    motions = {
-            k: Vector({
-                dir: TimeSeries(
-                       component.get("accel", None),
-                       component.get("veloc", None),
-                       component.get("displ", None),
-                    meta=dict(component=dir,
-                              station_channel=component["station_channel"],
-                              file_name = component["file_name"]
-                    )
-                )
-                for dir,component in motion.items()
-            }, dict(location_name=k))
-            for k, motion in file_data.items()
-    }
+                print(f"\t\t\tadded {file}", file=sys.stderr)
+
+
+    motions = []
+    for station_channel, (motion_data, channel) in file_data.items():
+        meta = MetaData(
+            station_channel = station_channel,
+            component       = motion_data["component"],
+            location        = motion_data["location_name"],
+            station_name    = motion_data["station_name"],
+            event_date      = motion_data["event_date"],
+            time_step       = motion_data["time_step"],
+        )
+        for stype, series in channel.items():
+            meta[f"peak_{stype}"]  = series.meta["peak_value"]
+            meta[f"units_{stype}"] = UNITS[stype]
+            meta["npts"] = series.meta["npts"]
+
+        # (data are taken through `vars` so that lazily
+        # read data are not loaded.)
+        motions.append(TimeSeries(
+            *(vars(channel[stype])[stype] if stype in channel else None
+                for stype in ("accel", "veloc", "displ")),
+            meta=meta
+        ))
 
     # Collect some other information from the first file (component)
-    # first_motion    = list(motions.values())[0]
-    # first_component = list(first_motion.components.values())[0]
-
+    first_motion = motions[0]
 
-    metadata = {
-        "file_name": str(read_file),
-        # "station_name":      first_component.get("station_name", "NA"),
-        # "station_coord":     first_component.get("station.coord", "NA"),
-        # "record_identifier": first_component.get("record_identifier", "NA"),
-        # "station_number":    first_component.get("station.no", "NA")
-    }
-    return Record(motions, event_date=date, meta=metadata)
+    metadata = MetaData(file_name=str(read_file))
+    metadata.update({k:v for k,v in first_motion.meta.items()
+                     if k in ['event_date','station_name']})
+    return Record(motions, meta=metadata)
 
 
-def read_record(read_file, archive = None, summarize=False):
+def read_record(read_file, archive = None, summarize=False, lazy=False, **kwds):
     """
     reads a single .smc file. it could be a.smc (accel),
     v.smc (veloc), or d.smc (displ).
+    if lazy, the data block is not decoded until it is first accessed.
+    other options of `evnt.read` (eg, ``workers``) do not apply to a
+    single file and are ignored.
     """
     NUM_COLUMNS = 8
 
-    with open_quake(read_file, "r", archive) as f:
-
-        # Text header; first 11 lines
-        txt_header = [next(f) for _ in range(11)]
-
-        # 48 integer values spanning 6 lines
-        int_header = np.genfromtxt(
-            f,
-            dtype=int,
-            max_rows=5,
-            ).flatten()
-        int_header = np.append(int_header , np.genfromtxt(
-            f,
-            dtype=int,
-            max_rows=1,
-            ).flatten()
-        )
-        assert len(int_header) == 48
+    # Open files on disk in binary mode so that
+    # `f.tell()` gives the byte offset of the data.
+    with open_quake(read_file, "r" if archive else "rb", archive) as f:
 
-        # Value representing "undefined" or "null" in the integer header.
-        int_null = int_header[0]
+        txt_header, int_header, real_header, comments = _read_headers(f)
+        len_accel = int_header[16]
 
-        # real_header = [next(f) for _ in range(10)]
+        # Parse data; when summarizing, stop reading here so that
+        # the rest of the file is never read or decompressed.
+        if summarize:
+            data = None
+        elif lazy and isinstance(read_file, (str, PathLike)) and read_file != "-":
+            data = FixedWidthBlock(read_file, f.tell(), None, len_accel, 10, NUM_COLUMNS,
+                                   archive=archive.filename if archive else None)
+        else:
+            # 8 values per line, each 10 characters wide; the data
+            # are the rest of the file, so they are read in one call
+            # rather than line by line.
+            data = decode_fixed_width(f.read(), len_accel, 10, NUM_COLUMNS)
 
-        real_header = np.genfromtxt(
-          f,
-          max_rows= 10,
-#         delimiter=10,
-        ).flatten()
+    return txt_header, int_header, real_header, comments, data
 
-        num_comment_lines = int_header[15]
-        len_accel = int_header[16]
 
-        # Parse comments
-        comments = [str(next(f)) for _ in range(num_comment_lines)]
+def _read_headers(f):
+    """
+    Read the text, integer and real headers and the comments
+    from the start of the open .smc file ``f``, leaving ``f``
+    at the first line of the data.
+    """
+    # Text header; first 11 lines. These are returned undecoded;
+    # `read_series` only decodes the lines that it uses.
+    txt_header = [next(f) for _ in range(11)]
 
-        # Parse data
+    # 48 integer values spanning 6 lines, in the format (8I10)
+    int_header = read_fixed_width(f, 48, 10, 8, dtype=int)
 
-        if not summarize:
-            options = dict(
-                delimiter=10,
-                # skip_header=HEADER_END_LINE + 1,
-                #
-            )
-            data = np.genfromtxt(f, max_rows=np.ceil(len_accel/NUM_COLUMNS) - 1, **options).flatten()
-            data = np.append(data, np.genfromtxt(f, max_rows=1, **options))
-        else:
-            data = []
+    # 50 real values spanning 10 lines, in the format (5E15.7)
+    real_header = read_fixed_width(f, 50, 15, 5)
 
-    return txt_header, int_header, real_header, comments, data
+    num_comment_lines = int_header[15]
+
+    # Parse comments
+    comments = [_decode(next(f)) for _ in range(num_comment_lines)]
+
+    return txt_header, int_header, real_header, comments
+
+
+def iter_chunks(read_file, chunk: int = 65536, archive: zipfile.ZipFile = None):
+    """
+    Read the series in a .smc file a chunk at a time, without loading
+    the whole file. The quantity (accel, veloc or displ) is the one
+    held by the file.
+
+    :param chunk:       number of samples in each chunk; rounded down
+                        to a whole number of lines of the file.
+
+    :return:            ``(time, data)`` for each chunk, where ``time``
+                        is the time of the first sample in ``data``.
+    :rtype:             generator of (float, np.ndarray)
+    """
+    NUM_COLUMNS = 8
+
+    with open_quake(read_file, "r" if archive else "rb", archive) as f:
+        _, int_header, real_header, _ = _read_headers(f)
+        time_step = 1/float(real_header[1])
+
+        start = 0
+        for data in iter_fixed_width(f, int_header[16], 10, NUM_COLUMNS, chunk):
+            yield start*time_step, data
+            start += len(data)
 
 
 def read_series(
@@ -183,34 +220,58 @@ def read_series(
     verbosity: int  = 0,
     summarize: bool =False,
     exclusions: tuple = (),
+    lazy: bool = False,
     **kwds
 ) -> TimeSeries:
     """
     reads a single .smc file. it could be a.smc (accel),
     v.smc (veloc), or d.smc (displ).
     """
-    txt_header, int_header, real_header, comments, data = read_record(read_file, archive, summarize=summarize)
+    txt_header, int_header, real_header, comments, data = read_record(read_file, archive,
+                                                                      summarize=summarize, lazy=lazy)
+    # Only the data type (line 1) and station (line 6) are used
+    data_type = _decode(txt_header[0])
 
     time_step = 1/float(real_header[1])
 
-    station = txt_header[5][10:].decode().split("component")[0].strip()
+    station, _, component = _decode(txt_header[5])[10:].partition("component=")
+    station = station.strip()
     location = station 
     for line in comments:
-        if "<loclbl" in line:
-            location = line[12:line.find("<end>")]
+        if "<loclbl=>" in line:
+            location = line[line.find("<loclbl=>")+9:line.find("<end>")]
             break
 
+    # Origin date and time
+    try:
+        event_date = datetime(*int_header[1:7], 1000*int_header[7]).isoformat()
+    except (ValueError, TypeError):
+        event_date = None
+
     motion_data = {
-        "component":       int(int_header[12]),
+        "component":       component.strip(),
         "location_name":   location,
-        "key":             _make_key(str(txt_header[5][10:]).split("component")[0].strip()),
+        "station_name":    station,
+        "event_date":      event_date,
+        "key":             _make_key(station),
         "station_channel": str(int_header[8]),
         "time_step":       time_step
     }
 
-    return TimeSeries([d for d in data], meta={"type": txt_header[0].decode(),
+    # Peak is the larger of the maximum and minimum values
+    # (real header fields 30 and 32), at times in fields 29 and 31.
+    real_null = real_header[0]
+    peak_time, peak_value = max(
+        ((t, v) for t, v in (real_header[28:30], real_header[30:32]) if v != real_null),
+        key=lambda tv: abs(tv[1]),
+        default=(None, None)
+    )
+
+    stype = SERIES_TYPES.get(str(read_file).split("_")[-1], "accel")
+    return TimeSeries(**{stype: data}, meta={"type": data_type.strip(),
                                     "ihdr": int_header,
                                     "rhdr": real_header,
+                                    "npts": int(int_header[16]),
+                                    "peak_value": float(peak_value) if peak_value is not None else None,
+                                    "peak_time":  float(peak_time)  if peak_time  is not None else None,
                                     "time_step": time_step}), motion_data
-
-
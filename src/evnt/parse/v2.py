@@ -7,11 +7,16 @@ Parse a CSMIP V2 strong motion data file.
 Format described by CGS at
 https://www.strongmotioncenter.org/vdc/cosmos_format_1_20.pdf
 """
+import io
 import re
 import sys
 import fnmatch
 import zipfile
+import functools
+from types import MappingProxyType
+from itertools import islice
 from datetime import datetime
+from os import PathLike
 from pathlib import Path
 from collections import defaultdict
 
@@ -27,6 +32,12 @@ from evnt.core import (
 from evnt.utils.parseutils import (
     parse_sequential_fields,
     open_quake,
+    read_quake,
+    read_fixed_width,
+    iter_fixed_width,
+    map_members,
+    LineCursor,
+    FixedWidthBlock,
     RE_DECIMAL,  # Regular expression for extracting decimal values
     RE_UNITS,    # Regular expression for extracting units
     CRE_WHITE,
@@ -35,10 +46,14 @@ from evnt.utils.parseutils import (
 )
 
 re_digits = re.compile(r"([0-9]+)")
+# Line that starts a data block, eg
+#   " 13000 points of accel data equally spaced at 0.005 sec, in cm/sec2. (8f10.6)"
+RE_COUNT  = re.compile(rf" *([0-9]+) *points of [a-z]* data equally spaced at *({RE_DECIMAL})", re.IGNORECASE)
 
 # Module constants
 NUM_COLUMNS = 8
 HEADER_END_LINE = 45
+V1_HEADER_END_LINE = 13+7+7
 
 INTEGER_HEADER_START_LINE = 25
 INTEGER_HEADER_END_LINE = 25+7
@@ -174,32 +189,62 @@ V1_HEADER_FIELDS.update({
     )
 })
 
-def read(path_to_zipfile, verbosity=0, summarize=False, **kwds):
+# Fields that are found on the first line of the velocity and
+# displacement blocks, rather than in the headers.
+BLOCK_FIELDS = {
+    "veloc": ("veloc.npts", "veloc.time_step"),
+    "displ": ("displ.npts", "displ.time_step"),
+}
+
+@functools.lru_cache(maxsize=None)
+def _parse_plan(v1: bool, exclusions: tuple):
+    """
+    Compile the parse table for a format and set of exclusions into
+    the fields to parse from the header lines, and the fields to parse
+    from the first line of each of the velocity and displacement blocks.
+    The plan is built once for each (v1, exclusions) and must not be
+    modified.
+    """
+    FIELDS = V1_HEADER_FIELDS if v1 else HEADER_FIELDS
+
+    # Collect keys to exclude
+    header_fields = {
+        k: v for k, v in FIELDS.items()
+        if not any(fnmatch.fnmatch(kk, x) for x in exclusions for kk in k)
+    }
+
+    block_fields = {
+        typ: MappingProxyType({keys: header_fields.pop(keys)})
+        for typ, keys in BLOCK_FIELDS.items() if keys in header_fields
+    }
+    return MappingProxyType(header_fields), MappingProxyType(block_fields)
+
+def read(path_to_zipfile, verbosity=0, summarize=False, workers=None, **kwds):
     """
     Take the name of a CSMIP v2 zip file and extract record data for the event.
+
+    If ``workers`` is given, the files in the archive are decompressed
+    and decoded over that many threads; the series are in the order
+    of the archive either way.
     """
 
     zippath    = Path(path_to_zipfile)
     archive    = zipfile.ZipFile(zippath)
-    motions    = []
 
-    v1 = False
-
-    # Loop over V1 and V2 files in the zipped archive
-    for file in archive.namelist():
-        # Disregard any files that are not V1 or V2
-        if not file.endswith((".v2", ".V2", ".v1", ".V1")):
-            continue
+    # Disregard any files that are not V1 or V2
+    files = [file for file in archive.namelist()
+             if file.endswith((".v2", ".V2", ".v1", ".V1"))]
 
+    def read_member(file):
         # Optional info logging
         if verbosity > 2: print(f"\t\t{file}", file=sys.stderr)
 
         v1 = True if file.endswith((".v1", ".V1")) else False
 
-        series = read_record(file, archive, verbosity=verbosity, summarize=summarize, v1=v1, **kwds)
-        # loc = make_key(series.meta.get("location_name", str(file)))
-        # drn = make_key(series.meta.get("component", "NA"))
-        motions.append(series)
+        return read_record(file, archive, verbosity=verbosity, summarize=summarize, v1=v1, **kwds)
+
+    # Loop over V1 and V2 files in the zipped archive
+    motions = map_members(read_member, files, workers)
 
     # Collect some other information from the first file (component)
     first_motion    = motions[0]
@@ -221,33 +266,45 @@ def read_record(
     summarize: bool = False,
     v1: bool = False,
     exclusions: tuple = (),
+    lazy: bool = False,
     **kwds
 ):
     """
     Read a single time series using the CSMIP .v2 (Volume 2) format
+
+    If ``lazy`` is True, the data blocks are located but not decoded;
+    each of ``accel``, ``veloc`` and ``displ`` is decoded from the file
+    the first time it is accessed.
     """
     if v1:
         exclusions = V1_EXCLUDE
-        FIELDS = V1_HEADER_FIELDS
-    else:
-        FIELDS = HEADER_FIELDS
 
     filename = Path(read_file)
 
     # 1. PARSE READABLE HEADER (Regular expressions)
-    # Collect keys to exclude
-    keys = []
-    for x in exclusions:
-        for k in FIELDS:
-            if any(fnmatch.fnmatch(kk,x) for kk in k):
-                keys.append(k)
-
-    header_fields = {k:v for k,v in FIELDS.items() if k not in keys}
+    header_fields, block_fields = _parse_plan(v1, tuple(exclusions))
+    header_lines = (V1_HEADER_END_LINE if v1 else HEADER_END_LINE) + 1
+
+    # Lazy reads only note where each block is in the file.
+    lazy = lazy and (archive or isinstance(read_file, (str, PathLike))) and read_file != "-"
+
+    # Read the file into memory once; the text header, numeric
+    # headers and data blocks are all parsed from this buffer.
+    # When summarizing or reading lazily, stop reading after the
+    # headers and the count line of the acceleration block.
+    if summarize or lazy:
+        buffer = read_quake(read_file, archive, max_lines=header_lines)
+    else:
+        buffer = read_quake(read_file, archive)
 
-    # Parse header fields
+    # Parse header fields; all of these are found on the lines up to
+    # the count line of the acceleration block, so the search stops
+    # there even when a field is missing.
     try:
-        with open_quake(read_file, "r", archive) as f:
-            header_data = parse_sequential_fields(f, header_fields, verbose=verbosity)
+        # (only the header lines are decoded, not the whole file)
+        header = LineCursor(buffer).read_lines(header_lines).decode("latin-1")
+        lines = islice(io.StringIO(header, newline=None), header_lines)
+        header_data = parse_sequential_fields(lines, header_fields, verbose=verbosity)
         header_data.pop("_")
     except:
         if verbosity:
@@ -255,93 +312,76 @@ def read_record(
         header_data = {}
 
 
+    # The summary ends at the count line of the acceleration block,
+    # which gives the number of points and time step even when the
+    # text header cannot be parsed (eg, older headers).
+    count_keys = ("accel.npts", "accel.time_step")
+    if summarize and count_keys in header_fields:
+        count_line = buffer.splitlines()[header_lines-1:header_lines]
+        match = count_line and RE_COUNT.match(count_line[0].decode("latin-1"))
+        if match:
+            header_data.setdefault(count_keys[0], int(match.group(1)))
+            header_data.setdefault(count_keys[1], float(match.group(2)))
+
+
     # 2. PARSE NUMERIC HEADERS
-    # Reopen and parse out data; Note, only the first call
-    # provides a skip_header argument as successive reads
-    # pick up where the previous left off.
-    with open_quake(read_file, "r", archive) as f:
-        # 50 integer values spanning 7 lines between lines 26-32
-        int_header = np.genfromtxt(
-            f,
-            dtype=int,
-            skip_header=13 if v1 else 25,
-            max_rows=6,
-            delimiter=5,
-            ).flatten()
-        # Read last row of int header separately because otherwise the last
-        # call would fail when the last row has a different number of columns
-        int_header = np.append(int_header , np.genfromtxt(
-            f,
-            dtype=int,
-            max_rows=1,
-            delimiter=5,
-            ).flatten()
-        )
+    # Note, successive reads pick up where the previous left off.
+    f = LineCursor(buffer)
+
+    if not summarize:
+        # Skip the text header
+        for _ in range(13 if v1 else 25):
+            next(f)
+
+        # 100 integer values spanning 7 lines between lines 26-32
+        int_header = read_fixed_width(f, 100, 5, columns=16, dtype=int)
         assert len(int_header) == 100, int_header[:5]
 
         # 100 floating point values on lines 33-45
-        real_header = np.genfromtxt(
-            f,
-            max_rows= 27-21 if v1 else 45-33,
-            delimiter=10,
-        ).flatten()
-        real_header = np.append(real_header , np.genfromtxt(
-            f,
-            max_rows=1,
-            delimiter=10,
-            ).flatten()
-        )
+        real_header = read_fixed_width(f, 50 if v1 else 100, 10)
 
         assert len(real_header) == (50 if v1 else 100)
 
         # Clean and process numeric header data, setup for parse stage 3.
         num_header = _process_numeric_headers_v2(int_header, real_header, header_data)
         # extract information about shape of data
-        s = next(f)
-        s = s if isinstance(s, str) else s.decode("utf-8")
+        s = next(f).decode("utf-8")
         len_accel = int(re.match("^ *([0-9]*) *.*", s).group(1))
-        # extract format specifier, eg "(8f9.6)" if provided
-        data_fmt = re.match(r"\(8f(.*)\)", s)
-        if data_fmt:
-            field_width = int(data_fmt.group(1).split(".")[0])
+        field_width = _field_width(s, 9 if v1 else 10)
+
+    # 3. PARSE OUT SENSOR DATA
+    # Note that successive reads will begin where we left off.
+    if summarize:
+        accel, veloc, displ = None, None, None
+
+    elif lazy:
+        # The buffer ends at the first line of the acceleration block;
+        # the blocks are found when they are loaded.
+        source = archive.filename if archive else None
+        accel = FixedWidthBlock(read_file, f.offset, None, len_accel, field_width,
+                                NUM_COLUMNS, archive=source)
+        if not v1:
+            rows  = -(-len_accel // NUM_COLUMNS)
+            veloc = _TrailingBlock(read_file, f.offset, rows, 0, field_width, archive=source)
+            displ = _TrailingBlock(read_file, f.offset, rows, 1, field_width, archive=source)
         else:
-            field_width = 9 if v1 else 10
+            veloc, displ = [], []
 
-        parse_options = dict(
-            delimiter = field_width,  # fields are 10 chars wide
-            dtype=float,
-        )
-
-        # 3. PARSE OUT SENSOR DATA
-        # Note that successive file reads will begin where we left off
-        if not summarize:
-            accel = np.genfromtxt(
-                f,
-                # skip_header=HEADER_END_LINE + 1,
-                max_rows=np.ceil(len_accel/NUM_COLUMNS) - 1,
-                **parse_options,
-            ).flatten()
-            accel = np.append(accel, np.genfromtxt(f,max_rows=1,**parse_options))
-            if not v1:
-                s = next(f)
-                s = s if isinstance(s, str) else s.decode("utf-8")
-                len_veloc = int(re.match("^ *([0-9]*)", s).group(0))
-                veloc = np.genfromtxt(
-                    f, max_rows=np.ceil(len_veloc/NUM_COLUMNS)-1, **parse_options
-                ).flatten()
-                veloc = np.append(veloc, np.genfromtxt(f,max_rows=1,**parse_options))
-
-                s = next(f)
-                s = s if isinstance(s, str) else s.decode("utf-8")
-                len_displ = int(re.match("^ *([0-9]*)", s).group(0))
-                displ = np.genfromtxt(
-                    f, max_rows=np.ceil(len_displ/NUM_COLUMNS)-1, **parse_options
-                ).flatten()
-                displ = np.append(displ, np.genfromtxt(f,max_rows=1,**parse_options))
-            else:
-                veloc, displ = [], []
+    else:
+        read_block = lambda n, w: read_fixed_width(f, n, w, NUM_COLUMNS)
+        accel = read_block(len_accel, field_width)
+        if not v1:
+            s = next(f).decode("utf-8")
+            _parse_block_fields(s, block_fields.get("veloc"), header_data)
+            len_veloc = int(re.match("^ *([0-9]*)", s).group(0))
+            veloc = read_block(len_veloc, _field_width(s, field_width))
+
+            s = next(f).decode("utf-8")
+            _parse_block_fields(s, block_fields.get("displ"), header_data)
+            len_displ = int(re.match("^ *([0-9]*)", s).group(0))
+            displ = read_block(len_displ, _field_width(s, field_width))
         else:
-            accel, veloc, displ = [], [], []
+            veloc, displ = [], []
 
 
 
@@ -394,6 +434,20 @@ def read_record(
     except:
         pass
 
+    # Summaries and lazy reads stop before the velocity and
+    # displacement blocks, but V2 files sample all three at the points
+    # stated for accel, veloc and displ in the text header (lines 16-17).
+    if (summarize or lazy) and not v1:
+        for typ in "veloc", "displ":
+            for k in "npts", "time_step":
+                if k in series_data["accel"]:
+                    series_data[typ].setdefault(k, series_data["accel"][k])
+
+    if summarize and "npts" in series_data["accel"]:
+        record_data["npts"] = series_data["accel"]["npts"]
+    elif lazy and not summarize:
+        record_data["npts"] = len_accel
+
     try:
         if series_data["accel"]["time_step"] == series_data["veloc"]["time_step"] == series_data["displ"]["time_step"]:
             record_data["time_step"] = series_data["accel"]["time_step"]
@@ -406,6 +460,102 @@ def read_record(
     return TimeSeries(accel, veloc, displ, meta=MetaData(**record_data))
 
 
+def iter_chunks(
+    read_file,
+    quantity: str = "accel",
+    chunk: int = 65536,
+    archive: zipfile.ZipFile = None,
+    v1: bool = False
+):
+    """
+    Read one series of a CSMIP .v2 (or .v1) file a chunk at a time,
+    without loading the whole file.
+
+    :param quantity:    one of ``"accel"``, ``"veloc"`` or ``"displ"``
+    :param chunk:       number of samples in each chunk; rounded down
+                        to a whole number of lines of the file.
+
+    :return:            ``(time, data)`` for each chunk, where ``time``
+                        is the time of the first sample in ``data``.
+    :rtype:             generator of (float, np.ndarray)
+    """
+    if quantity not in ("accel", "veloc", "displ") or (v1 and quantity != "accel"):
+        raise ValueError(f"Cannot read {quantity} from file {read_file}")
+
+    with open_quake(read_file, "r" if archive else "rb", archive) as f:
+        # Skip the text header and the numeric headers
+        for _ in range((13 + 7 + 7) if v1 else (25 + 7 + 13)):
+            next(f)
+
+        # Skip blocks until the requested quantity is reached
+        for typ in "accel", "veloc", "displ":
+            s = next(f)
+            s = s.decode("latin-1") if isinstance(s, bytes) else s
+            match = RE_COUNT.match(s)
+            npts  = int(match.group(1))
+            if typ == quantity:
+                break
+            for _ in range(-(-npts // NUM_COLUMNS)):
+                next(f)
+
+        time_step = float(match.group(2))
+        width = _field_width(s, 9 if v1 else 10)
+        start = 0
+        for data in iter_fixed_width(f, npts, width, NUM_COLUMNS, chunk):
+            yield start*time_step, data
+            start += len(data)
+
+
+def _parse_block_fields(line, fields, header_data):
+    # Parse the fields on the first line of a data block
+    # into header_data; see `_parse_plan`.
+    if fields:
+        try:
+            parse_sequential_fields((line,), fields, header_data)
+        except:
+            pass
+
+
+class _TrailingBlock(FixedWidthBlock):
+    """
+    The velocity (``block=0``) or displacement (``block=1``) block of
+    a V2 file, which is found when it is loaded by skipping the
+    ``rows`` lines of the acceleration block that start at ``offset``,
+    and then the blocks before it. The number of values and the field
+    width are taken from the first line of the block.
+    """
+    def __init__(self, file, offset, rows, block, width, archive=None):
+        super().__init__(file, offset, None, None, width, NUM_COLUMNS, archive=archive)
+        self.rows  = rows
+        self.block = block
+
+    def load(self) -> np.ndarray:
+        with self.open() as f:
+            f.seek(self.offset)
+            for _ in range(self.rows):
+                next(f)
+            for i in range(self.block + 1):
+                s = next(f).decode("latin-1")
+                count = int(re.match("^ *([0-9]*)", s).group(0))
+                if i == self.block:
+                    break
+                for _ in range(-(-count // NUM_COLUMNS)):
+                    next(f)
+
+            return read_fixed_width(f, count, _field_width(s, self.width), self.columns)
+
+
+def _field_width(line, default):
+    """
+    Extract the field width from the format specifier at the end
+    of a data block's count line, eg 10 from "(8f10.6)".
+    """
+    data_fmt = re.search(r"\(8f([0-9]+)\.[0-9]+\)", line, re.IGNORECASE)
+    if data_fmt:
+        return int(data_fmt.group(1))
+    return default
+
+
 def _process_numeric_headers_v2(ihdr, rhdr, txthdr):
     data = {}
     ref_azimuth = ihdr[32 -1]
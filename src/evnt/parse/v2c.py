@@ -451,7 +451,7 @@ FILE_TYPES = {
 }
 
 
-def read_record(read_file, *args):
+def read_record(read_file, *args, **kwds):
     file = Path(read_file)
     if file.suffix.lower() == ".v2":
         return read_record_v2(file)
@@ -0,0 +1,206 @@
+"""
+An on-disk cache of parsed records.
+
+Each cached file is stored in its own directory, holding the
+``float64`` arrays of its series as ``.npy`` files, which are
+memory-mapped when the entry is read back, and the metadata as
+JSON. Entries are keyed by the path of the file, the options it
+was parsed with, and its size, modification time and a hash of its
+contents, so that a changed file, or a file read with different
+options, is never served from the cache.
+"""
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from evnt.core import Record, TimeSeries, MetaData
+from evnt.utils.processing import encode_meta, decode_meta
+
+# Default location and size bound of the cache; the location
+# can be set with the EVNT_CACHE environment variable.
+CACHE_DIR = Path(os.environ.get("EVNT_CACHE", Path.home()/".cache"/"evnt"))
+MAX_SIZE  = 2**30
+
+SERIES_DATA = ("accel", "veloc", "displ")
+
+# Options of `evnt.read` that do not change the record that is read,
+# and so are not part of the key of a cache entry
+IGNORED_OPTIONS = ("workers", "verbosity", "lazy")
+
+
+def _hash(*parts) -> str:
+    h = hashlib.blake2b(digest_size=8)
+    for part in parts:
+        h.update(str(part).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class RecordCache:
+    """
+    Size-bounded cache of parsed `Record` and `TimeSeries` objects.
+    When the cache grows past ``max_size`` bytes, the least recently
+    used entries are removed.
+
+    :param directory:   directory in which to keep the cache;
+                        defaults to `CACHE_DIR`
+    :param max_size:    upper bound, in bytes, on the size of the cache
+    """
+    def __init__(self, directory=None, max_size: int = MAX_SIZE):
+        self.directory = Path(directory if directory is not None else CACHE_DIR)
+        self.max_size  = max_size
+
+    def __repr__(self):
+        return f"RecordCache({str(self.directory)!r}, max_size={self.max_size})"
+
+    def read(self, path, **kwds):
+        """
+        Return the cached record for ``path``, reading it with
+        `evnt.read` and adding it to the cache if it is not there.
+        """
+        record = self.get(path, **kwds)
+        if record is None:
+            import evnt
+            record = evnt.read(path, **kwds)
+            self.put(path, record, **kwds)
+        return record
+
+    def get(self, path, **kwds):
+        """
+        Return the cached `Record` or `TimeSeries` for ``path``, read
+        with the options ``kwds``, or ``None`` if there is no up to
+        date entry for it.
+        """
+        entry = self._entry(path, kwds)
+        try:
+            with open(entry/"record.json") as f:
+                index = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        load = lambda name: np.load(entry/name)
+        try:
+            # Mark the entry as recently used
+            os.utime(entry)
+            series = [
+                TimeSeries(**{attr: np.load(entry/name, mmap_mode="c")
+                                for attr, name in item["data"].items()},
+                           meta=MetaData(decode_meta(item["meta"], load)))
+                for item in index["series"]
+            ]
+            if index["type"] == "TimeSeries":
+                return series[0]
+            return Record(series, meta=MetaData(decode_meta(index["meta"], load)))
+        except FileNotFoundError:
+            # Evicted by another process while it was being read
+            return None
+
+    def put(self, path, record, **kwds):
+        """
+        Store ``record``, the result of reading ``path`` with the
+        options ``kwds``, in the cache, replacing any earlier entry
+        for ``path`` and those options. If another process has stored
+        the same entry in the meantime, it is kept.
+        """
+        if isinstance(record, TimeSeries):
+            index = {"type": "TimeSeries", "meta": None, "series": []}
+            series = [record]
+        else:
+            series = record.series
+            index  = {"type": "Record", "series": []}
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(dir=self.directory, prefix=".tmp-"))
+        try:
+            arrays = {}
+            if index["type"] == "Record":
+                index["meta"] = encode_meta(record.meta, arrays)
+            for s in series:
+                data = {}
+                for attr in SERIES_DATA:
+                    value = getattr(s, attr)
+                    if value is not None:
+                        name = f"{len(arrays)}.npy"
+                        arrays[name] = value
+                        data[attr] = name
+                index["series"].append({"data": data, "meta": encode_meta(s.meta, arrays)})
+
+            for name, value in arrays.items():
+                np.save(staging/name, np.asarray(value))
+            with open(staging/"record.json", "w") as f:
+                json.dump(index, f)
+
+            entry = self._entry(path, kwds)
+            # Entries for earlier contents of the file
+            for stale in self.directory.glob(entry.name.rpartition("-")[0] + "-*"):
+                if stale != entry:
+                    shutil.rmtree(stale, ignore_errors=True)
+            try:
+                os.replace(staging, entry)
+            except OSError:
+                if not entry.is_dir():
+                    raise
+                # Stored by another process; use theirs
+                shutil.rmtree(staging, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        self._evict()
+
+    def invalidate(self, path=None):
+        """
+        Remove the entries for ``path``, read with any options, from
+        the cache, or every entry if ``path`` is ``None``.
+        """
+        if not self.directory.exists():
+            return
+        pattern = "*" if path is None else f"{_hash(Path(path).resolve())}-*"
+        for entry in self.directory.glob(pattern):
+            shutil.rmtree(entry, ignore_errors=True)
+
+    @property
+    def size(self) -> int:
+        """Total size of the cached entries, in bytes."""
+        return sum(size for _, size, _ in self._entries())
+
+    def _entry(self, path, kwds: dict = None) -> Path:
+        # <path>-<options>-<contents>
+        options = sorted((k, v) for k, v in (kwds or {}).items() if k not in IGNORED_OPTIONS)
+        path = Path(path).resolve()
+        stat = path.stat()
+        h = hashlib.blake2b(digest_size=8)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1<<20), b""):
+                h.update(chunk)
+        return self.directory/f"{_hash(path)}-{_hash(options)}-{_hash(stat.st_size, stat.st_mtime_ns, h.hexdigest())}"
+
+    def _entries(self):
+        # (entry, size, last use) of each entry; entries removed by
+        # another process while they are listed are skipped.
+        if not self.directory.exists():
+            return []
+        entries = []
+        for entry in self.directory.glob("[!.]*-*"):
+            try:
+                if entry.is_dir():
+                    size = sum(f.stat().st_size for f in entry.iterdir())
+                    entries.append((entry, size, entry.stat().st_mtime_ns))
+            except FileNotFoundError:
+                continue
+        return entries
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        total   = sum(size for _, size, _ in entries)
+        for entry, size, _ in entries:
+            if total <= self.max_size:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
@@ -1,9 +1,15 @@
+import os
 import re
 import io
+import sys
 from os import PathLike
 from pathlib import Path
 from typing import Union, IO, Callable
+import zipfile
 import contextlib
+from itertools import islice
+
+import numpy as np
 
 # Regular expression for extracting decimal number
 RE_DECIMAL = "[-]?[0-9]*[.]?[0-9]*"
@@ -55,7 +61,89 @@ def open_quake(file, mode=None, archive=None):
             fh.close()
 
 
-def parse_sequential_fields(data, field_spec: dict, parsed_fields={}, verbose=False) -> dict:
+def read_quake(file, archive=None, max_lines: int = None) -> bytes:
+    """
+    Read the contents of ``file`` into memory, decompressing it only
+    once when it is a member of ``archive``.
+
+    :param file:        path, archive member name, open file, or ``"-"``
+    :param archive:     zipfile containing ``file``, if any
+    :type archive:      zipfile.ZipFile
+    :param max_lines:   if given, stop reading after this many lines;
+                        archive members are then streamed so that the
+                        rest of the member is never decompressed.
+
+    :return:            raw contents of the file
+    :rtype:             bytes
+    """
+    if max_lines is None:
+        if archive:
+            return archive.read(file)
+        elif isinstance(file, (PathLike, str)) and file != "-":
+            return Path(file).read_bytes()
+
+    if archive:
+        fh = archive.open(file, "r")
+    elif isinstance(file, (PathLike, str)) and file != "-":
+        fh = open(file, "rb")
+    else:
+        fh = contextlib.nullcontext(file if file != "-" else sys.stdin)
+
+    with fh as f:
+        data = [f.read()] if max_lines is None else list(islice(f, max_lines))
+
+    if data and isinstance(data[0], str):
+        return "".join(data).encode("latin-1")
+    return b"".join(data)
+
+
+class LineCursor:
+    """
+    Iterates line by line over an in-memory ``bytes`` buffer, keeping
+    track of the byte ``offset`` of the next line so that blocks of
+    lines can be sliced out of the buffer directly.
+    """
+    def __init__(self, buffer: bytes, offset: int = 0):
+        self.buffer = buffer
+        self.offset = offset
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> bytes:
+        start = self.offset
+        if start >= len(self.buffer):
+            raise StopIteration
+        end = self.buffer.find(b"\n", start) + 1
+        self.offset = end if end > 0 else len(self.buffer)
+        return self.buffer[start:self.offset]
+
+    def read_lines(self, nrows: int) -> bytes:
+        """
+        Return the next ``nrows`` lines as a single ``bytes`` block,
+        and advance past them.
+        """
+        start  = self.offset
+        stride = self.buffer.find(b"\n", start) + 1 - start
+        end    = start + (nrows - 1)*stride
+        # When the lines before the last are all the same length, jump
+        # straight to the last line instead of searching line by line.
+        if (nrows > 1 and stride > 0 and end <= len(self.buffer)
+            and self.buffer[end-1:end] == b"\n"
+            and self.buffer.count(b"\n", start, end) == nrows - 1):
+            self.offset = end
+            nrows = 1
+
+        for _ in range(nrows):
+            if next(self, None) is None:
+                break
+
+        return self.buffer[start:self.offset]
+
+
+def parse_sequential_fields(data, field_spec: dict, parsed_fields=None, verbose=False) -> dict:
+    if parsed_fields is None:
+        parsed_fields = {}
     field_iterator = iter(field_spec.items())
     fields, (typs, pat) = next(field_iterator)
     #print(f"\tfields: {fields}")
@@ -111,6 +199,168 @@ def parse_sequential_fields(data, field_spec: dict, parsed_fields={}, verbose=Fa
     return parsed_fields
 
 
+def decode_fixed_width(block, count: int, width: int, columns: int = 8, dtype=float) -> np.ndarray:
+    """
+    Decode ``count`` numeric fields from a block of Fortran-style
+    fixed-width text (e.g. ``(8f10.6)``), where each line holds
+    ``columns`` fields of ``width`` characters and the last line
+    may be short.
+
+    :param block:       raw text of the block, starting at its first line
+    :type block:        bytes or str
+    :param count:       number of values to decode
+    :param width:       number of characters in each field
+    :param columns:     number of fields on each full line
+
+    :return:            decoded values
+    :rtype:             1D np.ndarray of ``dtype``
+    """
+    if isinstance(block, str):
+        block = block.encode("latin-1")
+
+    count = int(count)
+    if count <= 0:
+        return np.empty(0, dtype=dtype)
+
+    row_width = width*columns
+    nrows     = -(-count // columns)
+    nfull     = count // columns
+
+    # When every full line has the same length, the block is a
+    # (nfull, stride) byte matrix and the fields can be cut out
+    # of it without splitting the text into lines.
+    text   = None
+    stride = block.find(b"\n") + 1
+    if stride > row_width and len(block) >= nfull*stride:
+        rows = np.frombuffer(block, dtype=np.uint8, count=nfull*stride).reshape(nfull, stride)
+        if np.all(rows[:,-1] == ord("\n")):
+            text = rows[:,:row_width].tobytes()
+            if nfull < nrows:
+                last = block[nfull*stride:nfull*stride+stride].split(b"\n", 1)[0].rstrip(b"\r")
+                text += last[:row_width].ljust(row_width)
+
+    # Otherwise, fall back to padding each line to the full row width.
+    if text is None:
+        text = b"".join(
+            line[:row_width].ljust(row_width) for line in islice(block.splitlines(), nrows)
+        )
+
+    fields = np.frombuffer(text, dtype=f"S{width}", count=count)
+    try:
+        return fields.astype(dtype)
+    except ValueError:
+        # Blank fields; fill them the way np.genfromtxt does.
+        fill = -1 if np.issubdtype(dtype, np.integer) else np.nan
+        return np.array([float(f) if f.strip() else fill for f in fields.tolist()]).astype(dtype)
+
+
+def read_fixed_width(f, count: int, width: int, columns: int = 8, dtype=float) -> np.ndarray:
+    """
+    Read the lines that hold ``count`` fixed-width fields from the open
+    file ``f`` and decode them with `decode_fixed_width`. Reading
+    picks up where ``f`` left off, and ``f`` is left positioned at the
+    line following the block.
+    """
+    nrows = -(-int(count) // columns)
+    if isinstance(f, LineCursor):
+        return decode_fixed_width(f.read_lines(nrows), count, width, columns, dtype)
+
+    lines = list(islice(f, nrows))
+    if lines and isinstance(lines[0], str):
+        block = "".join(lines).encode("latin-1")
+    else:
+        block = b"".join(lines)
+    return decode_fixed_width(block, count, width, columns, dtype)
+
+
+def iter_fixed_width(f, count: int, width: int, columns: int = 8, chunk: int = 65536):
+    """
+    Like `read_fixed_width`, but yield the ``count`` values in arrays
+    of ``chunk`` values (rounded down to a whole number of lines),
+    reading only one chunk of ``f`` at a time.
+    """
+    count = int(count)
+    chunk = max(int(chunk) // columns, 1) * columns
+    for start in range(0, count, chunk):
+        yield read_fixed_width(f, min(chunk, count - start), width, columns)
+
+
+class FixedWidthBlock:
+    """
+    Location of a block of fixed-width numeric fields within a file,
+    from which the block can be decoded later with `load`.
+
+    :param file:        path to the file, or name of the archive member
+    :param offset:      byte offset of the first line of the block
+    :param length:      length of the block in bytes, or ``None`` to
+                        read only the lines that hold ``count`` fields
+    :param count:       number of values in the block
+    :param width:       number of characters in each field
+    :param columns:     number of fields on each full line
+    :param archive:     path to the zipfile containing ``file``, if any
+    """
+    def __init__(self, file, offset: int, length: int, count: int, width: int,
+                 columns: int = 8, archive=None):
+        # Paths are made absolute so that the block can still be
+        # loaded after the working directory changes.
+        self.file    = file if archive is not None else os.path.abspath(file)
+        self.offset  = offset
+        self.length  = length
+        self.count   = count
+        self.width   = width
+        self.columns = columns
+        self.archive = None if archive is None else os.path.abspath(archive)
+
+    def __repr__(self):
+        return f"FixedWidthBlock({self.file}, offset={self.offset}, count={self.count})"
+
+    def load(self) -> np.ndarray:
+        """
+        Read and decode the block. Archive members are only
+        decompressed up to the end of the block.
+        """
+        with self.open() as f:
+            f.seek(self.offset)
+            if self.length is None:
+                return read_fixed_width(f, self.count, self.width, self.columns)
+            block = f.read(self.length)
+
+        return decode_fixed_width(block, self.count, self.width, self.columns)
+
+    @contextlib.contextmanager
+    def open(self):
+        """
+        Open the file holding the block for reading in binary mode.
+        """
+        if self.archive is not None:
+            with zipfile.ZipFile(self.archive) as archive, archive.open(self.file) as f:
+                yield f
+        else:
+            with open(self.file, "rb") as f:
+                yield f
+
+
+def map_members(function: Callable, members: list, workers: int = None) -> list:
+    """
+    Apply ``function`` to each of ``members`` (eg, the names of the
+    files in an archive), returning the results in the order of
+    ``members``.
+
+    :param workers:     number of threads over which the members are
+                        decoded; ``None``, ``0`` or ``1`` decodes them
+                        one at a time in the current thread. zlib and
+                        the NumPy conversions release the GIL, so the
+                        decompression and decoding of members overlap.
+    """
+    members = list(members)
+    if not workers or workers <= 1 or len(members) <= 1:
+        return [function(member) for member in members]
+
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=min(int(workers), len(members))) as pool:
+        return list(pool.map(function, members))
+
+
 def get_file_type(
     file: Union[str, Path, IO], file_type: str, module: str = None
 ) -> str:
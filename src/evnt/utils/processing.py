@@ -1,4 +1,6 @@
 import json
+import datetime
+from collections.abc import Mapping
 import numpy as np
 
 class json_serialize(json.JSONEncoder):
@@ -11,6 +13,50 @@ class json_serialize(json.JSONEncoder):
             return str(obj)
         if isinstance(obj, np.ndarray):
             return obj.tolist()
+        if isinstance(obj, datetime.datetime):
+            return obj.isoformat()
+        if isinstance(obj, Mapping):
+            return dict(obj)
         return json.JSONEncoder.default(self, obj)
     
-    
\ No newline at end of file
+    
+
+def encode_meta(value, arrays: dict):
+    """
+    Convert metadata into a JSON-able form that can be restored with
+    `decode_meta`. Arrays in ``value`` are moved into ``arrays``,
+    under a generated name that is stored in their place, so that they
+    can be saved alongside the JSON.
+    """
+    if isinstance(value, Mapping):
+        return {"dict": {k: encode_meta(v, arrays) for k, v in value.items()}}
+    elif isinstance(value, (list, tuple)):
+        return {type(value).__name__: [encode_meta(v, arrays) for v in value]}
+    elif isinstance(value, np.ndarray):
+        name = f"{len(arrays)}.npy"
+        arrays[name] = value
+        return {"ndarray": name}
+    elif isinstance(value, datetime.datetime):
+        return {"datetime": value.isoformat()}
+    elif isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def decode_meta(value, load):
+    """
+    Restore metadata encoded by `encode_meta`; ``load`` is called with
+    the name of each array and returns the array.
+    """
+    if not isinstance(value, dict):
+        return value
+    (kind, item), = value.items()
+    if kind == "dict":
+        return {k: decode_meta(v, load) for k, v in item.items()}
+    elif kind in ("list", "tuple"):
+        items = [decode_meta(v, load) for v in item]
+        return items if kind == "list" else tuple(items)
+    elif kind == "ndarray":
+        return load(item)
+    elif kind == "datetime":
+        return datetime.datetime.fromisoformat(item)
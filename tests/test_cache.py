@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import numpy as np
+
+import evnt
+
+csmip_archive = Path("dat/58658_007_20210426_10.09.54.P.zip")
+
+def test_cache(tmp_path):
+    from evnt.utils.cache import RecordCache
+    cache  = RecordCache(tmp_path)
+    record = evnt.read(csmip_archive, cache=cache)
+    cached = cache.get(csmip_archive)
+    assert len(cached.series) == len(record.series)
+    for a, b in zip(record.series, cached.series):
+        assert a.meta == b.meta
+        assert np.array_equal(a.accel, b.accel)
+    cache.invalidate(csmip_archive)
+    assert cache.get(csmip_archive) is None
+
+def test_cache_options(tmp_path):
+    from evnt.utils.cache import RecordCache
+    cache = RecordCache(tmp_path)
+    excluded = evnt.read(csmip_archive, cache=cache, exclusions=("*peak*",))
+    assert "peak_accel" not in excluded.series[0].meta
+    # Reading with other options is not served the filtered record
+    record = evnt.read(csmip_archive, cache=cache)
+    assert "peak_accel" in record.series[0].meta
+    assert "peak_accel" not in cache.get(csmip_archive, exclusions=("*peak*",)).series[0].meta
+
+    # An entry that was already stored (eg, by another process) is kept
+    cache.put(csmip_archive, record)
+    assert len(cache.get(csmip_archive).series) == len(record.series)
+
+def test_cache_evicted(tmp_path):
+    from evnt.utils.cache import RecordCache
+    cache  = RecordCache(tmp_path)
+    evnt.read(csmip_archive, cache=cache)
+    # Another process removes the arrays after the index is read
+    entry = cache._entry(csmip_archive)
+    for array in entry.glob("*.npy"):
+        array.unlink()
+    assert cache.get(csmip_archive) is None
+    assert cache.size > 0
@@ -0,0 +1,70 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from evnt.catalog import Catalog
+
+# Archives of each station directory
+archives = {
+    "NP1103":  Path("dat/berkeley_04jan2018_72948801_np1103p.zip"),
+    "CE58658": Path("dat/nc73654060_ce58658p.zip"),
+    "58658":   Path("dat/58658_007_20210426_10.09.54.P.zip"),
+}
+
+@pytest.fixture
+def tree(tmp_path):
+    for station, archive in archives.items():
+        (tmp_path/station).mkdir()
+        shutil.copy(archive, tmp_path/station/archive.name)
+    return tmp_path
+
+def test_catalog_update(tree):
+    with Catalog(tree/"catalog.db") as catalog:
+        assert catalog.update(tree)["added"] == 3
+        assert len(catalog) == 3
+        assert catalog.update(tree)["unchanged"] == 3
+
+        # Only changed files are read again
+        archive = next(tree.glob("NP1103/*.zip"))
+        stat = archive.stat()
+        os.utime(archive, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        counts = catalog.update(tree)
+        assert counts["updated"] == 1 and counts["unchanged"] == 2
+
+        archive.unlink()
+        assert catalog.update(tree)["removed"] == 1
+        assert len(catalog) == 2
+
+def test_catalog_query(tree):
+    catalog = Catalog()
+    catalog.update(tree)
+
+    rows = catalog.query(station="NP1103")
+    assert len(rows) == 1
+    assert (rows[0]["network"], rows[0]["station"]) == ("NP", "1103")
+
+    # Archives of one station share its number, whether or not
+    # their name gives the network
+    assert len(catalog.query(station="58658")) == 2
+    assert len(catalog.query(station="CE58658")) == 1
+    assert len(catalog.query(station__in="58658")) == 2
+    with pytest.raises(TypeError):
+        catalog.query(station__in=58658)
+    assert rows[0]["channels"] == 14
+    assert rows[0]["event_date"].startswith("2018-01-04")
+
+    peaks = [row["peak_accel"] for row in catalog.query()]
+    strong = catalog.query(peak_accel__gt=sorted(peaks)[1])
+    assert [row["peak_accel"] for row in strong] == [max(peaks)]
+    assert len(catalog.query(event_date__gte="2021", station__in=["58658", "1103"])) == 2
+
+    series = catalog.series(station="NP1103", location__like="%roof%")
+    assert series and all("roof" in s["location"].lower() for s in series)
+
+    record, = catalog.read(station="NP1103")
+    assert len(record.series) == 14
+
+    with pytest.raises(ValueError):
+        catalog.query(magnitude__gt=5)
@@ -0,0 +1,25 @@
+from pathlib import Path
+import json
+
+from evnt.__main__ import main
+
+csmip_archive = Path("dat/58658_007_20210426_10.09.54.P.zip")
+csmip_dir = Path("dat/58658_007_20210426_10.09.54.P/")
+
+def test_cli_summarize(capsys):
+    assert main(["evnt", "summarize", str(csmip_archive)]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 1
+    summary = json.loads(lines[0])
+    assert len(summary["series"]) == 20
+    assert summary["series"][0]["npts"] == 13000
+
+def test_cli_convert_names(tmp_path, capsys):
+    import shutil
+    for parent in "a", "b":
+        (tmp_path/parent).mkdir()
+        shutil.copy(csmip_dir/"chan001.v2", tmp_path/parent)
+    assert main(["evnt", "convert", "--output", str(tmp_path/"out"),
+                 str(tmp_path/"a"/"chan001.v2"), str(tmp_path/"b"/"chan001.v2")]) == 0
+    outputs = [json.loads(line)["output"] for line in capsys.readouterr().out.splitlines()]
+    assert sorted(Path(out).name for out in outputs) == ["chan001-1.json", "chan001-2.json"]
@@ -0,0 +1,168 @@
+import numpy as np
+
+from evnt.core import Vector, TimeSeries
+
+t = np.linspace(0, 10, 1001)
+
+def _vector():
+    return Vector({
+        "hor1": TimeSeries(np.sin(t), np.cos(t)),
+        "hor2": TimeSeries(np.cos(t), np.sin(t)),
+        "vert": TimeSeries(0.5*t, t),
+    })
+
+def test_vector_buffer():
+    vector = _vector()
+    accel = vector.accel
+    assert accel.shape == (len(t), 3)
+    assert np.array_equal(accel[:, 0], np.sin(t))
+    # Repeated access returns the same array, and the
+    # components are contiguous views of its columns
+    assert vector.accel is accel
+    for component in vector.components.values():
+        assert np.shares_memory(component.accel, accel)
+        assert component.accel.flags.c_contiguous
+    assert vector.displ is None
+
+    # Replacing a component's data rebuilds the buffer
+    vector.components["vert"].accel = np.zeros_like(t)
+    assert vector.accel is not accel
+    assert not vector.accel[:, 2].any()
+
+def test_vector_rotate():
+    vector = _vector()
+    hor1 = vector.components["hor1"].accel.copy()
+    hor2 = vector.components["hor2"].accel.copy()
+    vector.rotate(np.pi/2)
+    assert np.allclose(vector.components["hor1"].accel, -hor2)
+    assert np.allclose(vector.components["hor2"].accel, hor1)
+    assert np.allclose(vector.accel[:, 0], -hor2)
+
+def test_vector_resultant():
+    vector = _vector()
+    resultant = vector.resultant()
+    assert np.allclose(resultant.accel, np.sqrt(1 + 0.25*t**2))
+    assert np.allclose(resultant.veloc, np.sqrt(1 + t**2))
+    assert resultant.displ is None
+
+    # no horizontal or vertical components
+    other = Vector({"x": TimeSeries(np.sin(t), np.cos(t))}).resultant()
+    assert np.array_equal(other.accel, np.zeros_like(t))
+
+def test_vector_rotate_copy():
+    vector = _vector()
+    accel = vector.accel.copy()
+    rotated = vector.rotate(np.pi/2, inplace=False)
+    assert np.array_equal(vector.accel, accel)
+    assert np.allclose(rotated.components["hor1"].accel, -accel[:, 1])
+    assert np.array_equal(rotated.components["vert"].accel, accel[:, 2])
+
+    # A 3x3 rotation includes the vertical component
+    flip = np.diag([1.0, 1.0, -1.0])
+    assert np.allclose(vector.rotate(rotation=flip, inplace=False).accel[:, 2], -accel[:, 2])
+
+def test_vector_rotate_sweep():
+    vector = _vector()
+    angles = np.linspace(0, np.pi, 7)
+    rotated = vector.rotate(angles, inplace=False)
+    assert len(rotated) == len(angles)
+    for angle, each in zip(angles, rotated):
+        expected = vector.rotate(angle, inplace=False)
+        assert np.allclose(each.accel, expected.accel)
+        assert np.allclose(each.veloc, expected.veloc)
+
+def test_vector_rotd():
+    vector = _vector()
+    angles = np.radians(np.arange(180))
+    peaks = [np.abs(v.components["hor1"].accel).max()
+             for v in vector.rotate(-angles, inplace=False)]
+    values = vector.rotd(angles=angles, max_size=5000)
+    assert list(values) == ["rotd00", "rotd50", "rotd100"]
+    assert np.isclose(values["rotd00"], min(peaks))
+    assert np.isclose(values["rotd50"], np.median(peaks))
+    assert np.isclose(values["rotd100"], max(peaks))
+
+    # Oscillator responses for each period
+    response = np.stack([vector.accel.T, 2*vector.accel.T])[:, :2]
+    spectrum = vector.rotd(response=response)
+    assert np.allclose(spectrum["rotd50"], [values["rotd50"], 2*values["rotd50"]])
+
+def test_record_index():
+    import pytest
+    from evnt.core import Record, group_by_location
+    series = [
+        TimeSeries(t, meta={"station_channel": i, "floor": i // 3, "component": ("hor1", "hor2", "vert")[i % 3],
+                            "location": f"floor {i // 3}"})
+        for i in range(9)
+    ]
+    record = Record(series)
+    assert record.filter(floor=1) == series[3:6]
+    assert record.filter(floor=1, component="vert") == [series[5]]
+    assert record.filter(floor=5) == []
+    assert record.filter(station_channel=[1]) == []
+    assert record.find(floor=2, component="hor1") is series[6]
+    with pytest.raises(Exception):
+        record.find(floor=2)
+    assert group_by_location(record) == group_by_location(series)
+
+    record.append(TimeSeries(t, meta={"station_channel": 9, "floor": 3, "component": "hor1"}))
+    assert len(record.filter(floor=3)) == 1
+    assert record.group_by("component")["hor1"] == [series[0], series[3], series[6], record.series[-1]]
+
+def test_compact_meta():
+    import json
+    import pickle
+    import evnt
+    from evnt.core import CompactMetaData
+    from evnt.utils.processing import json_serialize
+
+    record = evnt.read("dat/58658_007_20210426_10.09.54.P.zip", summarize=True)
+    expected = [dict(s.meta) for s in record.series]
+    record.compact()
+    assert all(isinstance(s.meta, CompactMetaData) for s in record.series)
+    assert [dict(s.meta) for s in record.series] == expected
+    assert record.series[0].meta == expected[0]
+
+    # Station and event items are stored once for all series
+    first, second = record.series[0].meta, record.series[1].meta
+    assert first._shared is second._shared
+    assert "station_name" in first._shared
+    assert first.npts == first["npts"] == expected[0]["npts"]
+    assert first.station_name == expected[0]["station_name"]
+
+    # Changing a shared item only changes this series
+    first["station_name"] = "other"
+    assert second["station_name"] == expected[1]["station_name"]
+    del first["station_name"]
+    assert "station_name" not in first and "station_name" in second
+
+    assert pickle.loads(pickle.dumps(second)) == second
+    assert json.loads(json.dumps(second, cls=json_serialize)) == json.loads(json.dumps(expected[1]))
+    assert record.find(station_channel=expected[2]["station_channel"]) is record.series[2]
+
+def test_time_axis():
+    from evnt.core import TimeAxis
+    series = TimeSeries(np.zeros(13000), meta={"time_step": 0.005, "npts": 13000})
+    time = series.time
+    assert time == TimeAxis(0.0, 0.005, 13000)
+    expected = 0.005*np.arange(13000)
+    assert len(time) == 13000
+    assert time[10] == expected[10] and time[-1] == expected[-1]
+    assert np.allclose(time[100:200:3], expected[100:200:3])
+    assert np.array_equal(time[[1, -2]], expected[[1, -2]])
+
+    # Equal axes share one array of times
+    other = TimeSeries(np.ones(13000), meta={"time_step": 0.005, "npts": 13000})
+    assert np.asarray(other.time) is np.asarray(time)
+    assert np.array_equal(np.asarray(time), expected)
+
+    # and the array is released once nothing refers to it
+    import weakref
+    ref = weakref.ref(np.asarray(TimeAxis(1.0, 0.5, 10)))
+    assert ref() is None
+
+    t = np.array([-1.0, 0.0, 0.0025, 1.0, 12.34, 64.995, 70.0])
+    for side in ("left", "right"):
+        assert np.array_equal(time.searchsorted(t, side), np.searchsorted(expected, t, side))
+    values = np.sin(expected)
+    assert np.allclose(time.interp(t, values), np.interp(t, expected, values))
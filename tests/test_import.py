@@ -0,0 +1,30 @@
+import sys
+import subprocess
+
+# Modules that `import evnt` must not load
+HEAVY = ("numpy", "scipy", "pandas", "matplotlib", "gmprocess", "multitaper", "quakeio")
+
+def _loaded_after(statement):
+    code = f"import sys; {statement}; print(' '.join(sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return set(out.stdout.split())
+
+def test_import_is_light():
+    modules = _loaded_after("import evnt")
+    assert not {m for m in modules if m.split(".")[0] in HEAVY}
+    assert not {m for m in modules if m.startswith("evnt.")}
+
+def test_no_plot_settings_on_import():
+    modules = _loaded_after("import evnt.param.asce, evnt.param.stats, evnt.parse.compute_params")
+    assert "matplotlib" not in modules
+
+def test_lazy_submodules():
+    import evnt
+    assert evnt.parse.v2.read_record is not None
+    assert callable(evnt.utils.parseutils.decode_fixed_width)
+
+def test_reexports():
+    import evnt
+    from evnt.core import get_parser
+    assert evnt.get_parser is get_parser
+    assert "get_parser" in dir(evnt)
@@ -0,0 +1,38 @@
+from pathlib import Path
+
+import numpy as np
+
+import evnt
+
+csmip_archive = Path("dat/58658_007_20210426_10.09.54.P.zip")
+
+def test_native_archive(tmp_path):
+    from evnt.parse import native
+    record = evnt.read(csmip_archive)
+    native.write(tmp_path/"station.evnt", record)
+    native.append(tmp_path/"station.evnt", record)
+    records = native.read(tmp_path/"station.evnt")
+    assert len(records) == 2
+    for read_back in records:
+        assert read_back.meta == record.meta
+        for a, b in zip(record.series, read_back.series):
+            assert a.meta == b.meta
+            assert isinstance(b.accel, np.memmap)
+            assert np.array_equal(a.accel, b.accel)
+
+def test_native_interrupted_append(tmp_path):
+    from evnt.parse import native
+    record = evnt.read(csmip_archive)
+    path = tmp_path/"station.evnt"
+    native.write(path, record)
+    size = path.stat().st_size
+    native.append(path, record)
+
+    # An append that stopped before its footer was written
+    with open(path, "r+b") as f:
+        f.truncate(path.stat().st_size - native.FOOTER.size)
+    assert path.stat().st_size > size
+    assert len(native.read(path)) == 1
+
+    native.append(path, record)
+    assert len(native.read(path)) == 2
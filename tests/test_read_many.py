@@ -0,0 +1,20 @@
+from pathlib import Path
+
+import evnt
+
+csmip_archive = Path("dat/58658_007_20210426_10.09.54.P.zip")
+
+def test_read_many():
+    paths = [csmip_archive, Path("dat/imperialvalley79_ce01336p.zip"), Path("dat/missing.zip")]
+    calls = []
+    results = list(evnt.read_many(paths, workers=2, summarize=True,
+                                  progress=lambda done, total: calls.append((done, total))))
+    assert [path for path, _ in results] == paths
+    assert len(results[0][1].series) == 20
+    assert isinstance(results[2][1], Exception)
+    assert calls[-1] == (3, 3)
+
+def test_read_many_chunksize():
+    paths = [csmip_archive, csmip_archive]
+    results = list(evnt.read_many(paths, workers=0, chunksize=0, summarize=True))
+    assert [path for path, _ in results] == paths
@@ -1,3 +1,13 @@
+from pathlib import Path
+import zipfile
+
+import numpy as np
+
+import evnt
+
+nsmp_archive = Path("dat/berkeley_04jan2018_72948801_np1103p.zip")
+
+
 # #!/bin/env python
 # from pathlib import Path
 # import json
@@ -35,3 +45,44 @@
 #         json.dump(nsmp_record, writefile)
 
 
+
+
+def test_read_channels():
+    event = evnt.read(nsmp_archive)
+    assert len(event.series) == 14
+    series = event.series[0]
+    assert len(series.accel) == len(series.veloc) == len(series.displ) == 8200
+
+def test_summarize():
+    event = evnt.read(nsmp_archive, summarize=True)
+    series = event.series[0]
+    assert series.accel is None
+    assert series.meta["npts"] == 8200
+    assert series.meta["time_step"] == 0.005
+    assert series.meta["location"] == "4th floor, east core"
+
+def test_workers():
+    serial   = evnt.read(nsmp_archive)
+    threaded = evnt.read(nsmp_archive, workers=4)
+    assert threaded.meta == serial.meta
+    assert [s.meta["station_channel"] for s in threaded.series] == \
+           [s.meta["station_channel"] for s in serial.series]
+    for a, b in zip(threaded.series, serial.series):
+        assert np.array_equal(a.displ, b.displ)
+
+def test_iter_chunks():
+    with zipfile.ZipFile(nsmp_archive) as archive:
+        file = "1103.HN2.NP.4E_v.smc"
+        series = evnt.parse.smc.read_series(file, archive)[0]
+        chunks = list(evnt.parse.smc.iter_chunks(file, chunk=1000, archive=archive))
+    assert [len(data) for _, data in chunks[:2]] == [1000, 1000]
+    assert chunks[1][0] == 1000*0.005
+    assert np.array_equal(np.concatenate([data for _, data in chunks]), series.veloc)
+
+def test_read_file_workers(tmp_path):
+    with zipfile.ZipFile(nsmp_archive) as archive:
+        file = archive.extract("1103.HN2.NP.4E_a.smc", tmp_path)
+    # options for archives, like workers, are ignored for one file
+    threaded, serial = evnt.read(file, workers=4), evnt.read(file)
+    assert threaded[0] == serial[0]
+    assert np.array_equal(threaded[-1], serial[-1])
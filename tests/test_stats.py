@@ -0,0 +1,76 @@
+import numpy as np
+from scipy.stats import skew, kurtosis
+
+from evnt.param.stats import stats, envelope, cav, STATISTICS, OPTIONAL_STATISTICS
+
+fs = 100.0
+data = np.sin(np.linspace(0, 40*np.pi, 3000)) * np.linspace(0, 5, 3000)
+
+def test_stats():
+    values = stats(data, fs)
+    assert np.isclose(values["mean"], np.mean(data))
+    assert np.isclose(values["standard_deviation"], np.std(data))
+    assert np.isclose(values["rms"], np.sqrt(np.mean(data**2)))
+    assert np.isclose(values["pga"], np.max(np.abs(data)))
+    smooth = envelope(data)
+    assert np.isclose(values["skewness"], skew(smooth))
+    assert np.isclose(values["kurtosis"], kurtosis(smooth))
+    assert values["cav"] == cav(data, fs)
+
+def test_stats_short():
+    # shorter than the envelope window
+    short = data[:20]
+    values = stats(short, fs, which=["skewness", "kurtosis"])
+    smooth = envelope(short)
+    assert np.isclose(values["skewness"], skew(smooth))
+    assert np.isclose(values["kurtosis"], kurtosis(smooth))
+
+def test_stats_which():
+    assert list(stats(data, fs, which=["pga", "rms"])) == ["pga", "rms"]
+
+def test_envelope():
+    from scipy.signal import hilbert
+    expected = np.convolve(np.abs(hilbert(data)), np.ones(50)/50, mode="same")
+    assert np.allclose(envelope(data, 50), expected)
+    # traces shorter than the window, as np.convolve
+    short = data[:20]
+    expected = np.convolve(np.abs(hilbert(short)), np.ones(50)/50, mode="same")
+    assert envelope(short, 50).shape == (50,)
+    assert np.allclose(envelope(short, 50), expected)
+
+def test_cav_windows():
+    total, windows = cav(data, fs, return_windows=True)
+    assert len(windows) == 30
+    assert np.isclose(total, windows.sum())
+    assert cav(data, fs, standardized=False) >= total
+
+def test_stats_batched():
+    traces = np.stack([data, 2*data[::-1], data + 1])
+    batched = stats(traces, fs, which=STATISTICS + OPTIONAL_STATISTICS)
+    for i, trace in enumerate(traces):
+        single = stats(trace, fs, which=batched.keys())
+        for name, value in single.items():
+            assert np.isclose(batched[name][i], value)
+
+def test_stats_lengths():
+    traces = np.stack([data, data])
+    traces[1, 2000:] = 0.0
+    values = stats(traces, fs, which=["rms", "cav"], lengths=[3000, 2000])
+    assert np.isclose(values["rms"][1], stats(data[:2000], fs)["rms"])
+    assert np.isclose(values["cav"][1], cav(data[:2000], fs))
+
+def test_record_stats():
+    import evnt
+    from evnt.param.stats import record_stats
+    record = evnt.read("dat/58658_007_20210426_10.09.54.P.zip")
+    table = record_stats(record, which=["pga", "cav"])
+    assert len(table) == 20
+    assert np.isclose(table.loc["1", "pga"], record.series[0].meta["peak_accel"]/100, rtol=1e-3)
+
+def test_record_stats_no_time_step():
+    from evnt.core import Record, TimeSeries
+    from evnt.param.stats import record_stats
+    record = Record([TimeSeries(data, meta={"station_channel": "1"})])
+    table = record_stats(record, which=["pga", "cav"])
+    assert np.isclose(table.loc["1", "pga"], np.abs(data).max()/100)
+    assert np.isnan(table.loc["1", "cav"])
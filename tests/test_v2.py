@@ -1,7 +1,10 @@
 #!/bin/env python
 from pathlib import Path
+import io
 import json
 
+import numpy as np
+
 import evnt
 
 csmip_archive = Path("dat/58658_007_20210426_10.09.54.P.zip")
@@ -22,13 +25,11 @@ def test_unique():
 #----------------------------------------------------------------------
 def test_2():
     csmip_series = evnt.parse.v2.read_record(csmip_dir / "chan001.v2")
-    with open("-", "w") as writefile:
-        json.dump(csmip_series.meta, writefile)
+    json.dump(csmip_series.meta, io.StringIO())
 
 def test_read():
     csmip_series = evnt.read(csmip_dir / "chan001.v2")
-    with open("-", "w") as writefile:
-        json.dump(csmip_series.meta, writefile)
+    json.dump(csmip_series.meta, io.StringIO())
     return csmip_series
 
 def test_peak():
@@ -47,6 +48,64 @@ def test_veloc_data():
     assert series.veloc[0]  == 0.0000950
     assert series.veloc[-1] == 0.0001009
 
+def test_displ_data():
+    series = test_read()
+    assert len(series.displ) == 13000
+    assert series.displ[0]  ==  0.0000997
+    assert series.displ[-1] == -0.0001056
+
+def test_archive_meta():
+    # members of an archive parse the same as files on disk
+    event_meta  = test_read_event().series[0].meta
+    series_meta = test_read().meta
+    for key in "station_name", "location", "units_displ":
+        assert event_meta[key] == series_meta[key]
+
+def test_summarize():
+    event = evnt.read(csmip_archive, summarize=True)
+    assert len(event.series) == 20
+    series = event.series[0]
+    assert series.accel is None
+    assert series.meta["npts"] == 13000
+    assert series.meta["time_step"] == 0.005
+    assert series.meta["peak_accel"] == 17.433
+
+    # older headers, which are not parsed, still give the shape
+    legacy = evnt.read(Path("dat/imperialvalley79_ce01336p.zip"), summarize=True)
+    assert legacy.series[0].meta["npts"] == 1138
+    assert legacy.series[0].meta["time_step"] == 0.02
+
+def test_lazy(monkeypatch, tmp_path):
+    lazy  = evnt.read(csmip_archive, lazy=True)
+    eager = evnt.read(csmip_archive)
+    assert lazy.series[0].meta["npts"] == 13000
+    assert [s.meta for s in lazy.series] == [s.meta for s in eager.series]
+    # blocks are loaded from the archive after the directory changes
+    monkeypatch.chdir(tmp_path)
+    for a, b in zip(lazy.series, eager.series):
+        assert np.array_equal(a.accel, b.accel)
+        assert np.array_equal(a.veloc, b.veloc)
+        assert np.array_equal(a.displ, b.displ)
+
+def test_workers():
+    serial   = evnt.read(csmip_archive)
+    threaded = evnt.read(csmip_archive, workers=4)
+    assert threaded.meta == serial.meta
+    assert [s.meta for s in threaded.series] == [s.meta for s in serial.series]
+    for a, b in zip(threaded.series, serial.series):
+        assert np.array_equal(a.accel, b.accel)
+
+def test_iter_chunks():
+    series = evnt.parse.v2.read_record(csmip_dir/"chan001.v2")
+    chunks = list(evnt.parse.v2.iter_chunks(csmip_dir/"chan001.v2", "displ", chunk=1000))
+    assert chunks[1][0] == 1000*0.005
+    assert np.array_equal(np.concatenate([data for _, data in chunks]), series.displ)
+
+def test_fixed_width_partial_row():
+    block = b"  1.000000 -2.500000\r\n  3.250000\r\n"
+    data = evnt.utils.parseutils.decode_fixed_width(block, 3, 10, columns=2)
+    assert list(data) == [1.0, -2.5, 3.25]
+
 
 if __name__ == "__main__":
     import sys, yaml